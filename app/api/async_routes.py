@@ -0,0 +1,69 @@
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.exc import NoResultFound
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import RiskListParams, etag_matches, get_async_db, not_modified, risk_list_params
+from app.api.routes import page_response
+from app.schemas.risk import RiskBrief, RiskListResponse, RiskResponse
+from app.services import risk_service
+
+# Async variants of the read endpoints. create_app mounts this router ahead of the sync one when
+# settings.async_db is enabled, so these handlers take precedence for the same paths.
+router = APIRouter()
+
+
+@router.get("/risks", response_model=RiskListResponse, response_class=ORJSONResponse)
+async def list_risks(
+    params: RiskListParams = Depends(risk_list_params),
+    if_none_match: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    etag = await risk_service.get_collection_etag_async(
+        db, params.filters, params.limit, params.cursor, params.fields
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    try:
+        risks, next_cursor = await risk_service.get_risk_page_async(
+            db,
+            params.filters,
+            limit=params.limit,
+            cursor=params.cursor,
+            fields=params.fields,
+            trusted=True,
+            etag=etag,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return page_response(etag, risks, next_cursor)
+
+
+@router.get("/risks/brief", response_model=List[RiskBrief])
+async def brief_risks(
+    ids: Optional[str] = Query(default=None),
+    db: AsyncSession = Depends(get_async_db),
+) -> List[RiskBrief]:
+    id_list = ids.split(",") if ids else None
+    return await risk_service.get_brief_async(db, id_list)
+
+
+@router.get("/risks/{risk_id}", response_model=RiskResponse)
+async def fetch_risk(
+    risk_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+) -> Any:
+    try:
+        etag = await risk_service.get_risk_etag_async(db, risk_id)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        risk = await risk_service.get_risk_async(db, risk_id, etag)
+    except NoResultFound as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    # Tag the body actually returned, in case the row changed after the ETag was read.
+    response.headers["ETag"] = risk_service.risk_etag(risk)
+    return risk
@@ -1,10 +1,13 @@
-from typing import Generator, Optional
+from dataclasses import dataclass
+from typing import AsyncGenerator, Generator, List, Optional
 
-from fastapi import Depends, Header, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.db.session import get_session
+from app.db.session import get_async_session, get_session
+from app.services.risk_service import RiskFilters
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -12,6 +15,66 @@ def get_db() -> Generator[Session, None, None]:
         yield session
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with get_async_session() as session:
+        yield session
+
+
 def enforce_api_token(x_api_key: Optional[str] = Header(default=None)) -> None:
     if settings.api_token and settings.api_token != x_api_key:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or missing API token")
+
+
+@dataclass
+class RiskListParams:
+    filters: RiskFilters
+    limit: int
+    cursor: Optional[str]
+    fields: Optional[List[str]]
+
+
+def risk_list_params(
+    q: Optional[str] = None,
+    min_impact: Optional[int] = Query(default=None, ge=1, le=5),
+    limit: int = Query(default=None, gt=0),
+    ids: Optional[str] = Query(default=None),
+    category: Optional[str] = Query(default=None),
+    lifecycle_stage: Optional[str] = Query(default=None),
+    altai: Optional[str] = Query(default=None, description="Filter by ALTAI requirement id"),
+    context: Optional[str] = Query(default=None, description="Filter by linked energy context id"),
+    min_exposure: Optional[int] = Query(default=None, ge=1, le=5, description="Minimum risk_context exposure level"),
+    min_criticality: Optional[int] = Query(
+        default=None, ge=1, le=5, description="Minimum criticality of a linked energy context"
+    ),
+    cursor: Optional[str] = Query(default=None, description="Opaque cursor from a previous X-Next-Cursor header"),
+    fields: Optional[str] = Query(
+        default=None, description="Comma-separated card fields to return instead of the full card"
+    ),
+) -> RiskListParams:
+    limit = limit or settings.default_limit
+    limit = min(limit, settings.max_limit)
+    id_list: Optional[List[str]] = ids.split(",") if ids else None
+    field_list: Optional[List[str]] = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+    filters = RiskFilters(
+        q=q,
+        min_impact=min_impact,
+        ids=tuple(id_list) if id_list else None,
+        category=category,
+        lifecycle_stage=lifecycle_stage,
+        altai=altai,
+        context=context,
+        min_exposure=min_exposure,
+        min_criticality=min_criticality,
+    )
+    return RiskListParams(filters=filters, limit=limit, cursor=cursor, fields=field_list)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
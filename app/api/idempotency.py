@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import re
+from typing import List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.db.session import get_session
+from app.services import idempotency_service
+from app.services.idempotency_service import IdempotencyKeyInUse, IdempotencyKeyMismatch, StoredResponse
+
+# Write routes only; reads such as POST /risks/batch-get are never buffered or stored.
+IDEMPOTENT_ROUTES = (
+    ("POST", re.compile(r"^/risks(/bulk)?$")),
+    ("PUT", re.compile(r"^/risks/[^/]+$")),
+    ("PATCH", re.compile(r"^/risks/[^/]+$")),
+)
+MAX_KEY_LENGTH = 255
+# Response headers worth replaying; content-length is recomputed.
+STORED_HEADERS = ("content-type", "etag", "location", "x-next-cursor")
+
+
+def is_idempotent_route(method: str, path: str) -> bool:
+    return any(method == route_method and pattern.match(path) for route_method, pattern in IDEMPOTENT_ROUTES)
+
+
+class IdempotencyMiddleware:
+    """Replay the stored response for writes retried with the same ``Idempotency-Key``.
+
+    The key is claimed before the request reaches the router, so a retry never re-validates the
+    body or touches the risk again. Only successful (2xx) responses are stored; any other outcome
+    releases the key so the client can retry. Plain ASGI, so every other request (streamed exports
+    included) passes straight through untouched.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not is_idempotent_route(scope["method"], scope["path"]):
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        key = headers.get("idempotency-key")
+        if not key:
+            await self.app(scope, receive, send)
+            return
+        if len(key) > MAX_KEY_LENGTH:
+            response = JSONResponse({"detail": f"Idempotency-Key longer than {MAX_KEY_LENGTH} characters"}, status_code=400)
+            await response(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        fingerprint = idempotency_service.request_fingerprint(
+            scope["method"], scope["path"], body, headers.get("x-api-key")
+        )
+        try:
+            stored = await run_in_threadpool(_claim, key, fingerprint)
+        except IdempotencyKeyMismatch:
+            response = JSONResponse({"detail": "Idempotency-Key was already used for a different request"}, status_code=422)
+            await response(scope, receive, send)
+            return
+        except IdempotencyKeyInUse:
+            response = JSONResponse({"detail": "A request with this Idempotency-Key is still in progress"}, status_code=409)
+            await response(scope, receive, send)
+            return
+        if stored is not None:
+            headers = {**stored.headers, "Idempotent-Replayed": "true"}
+            await Response(stored.body, status_code=stored.status_code, headers=headers)(scope, receive, send)
+            return
+
+        body_sent = False
+
+        async def replay_receive() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        start: Optional[Message] = None
+        chunks: List[bytes] = []
+
+        async def capture_send(message: Message) -> None:
+            # Held back until the outcome is recorded, so a retry never sees the key still in progress.
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        except Exception:
+            await run_in_threadpool(_release, key)
+            raise
+        if start is None:
+            await run_in_threadpool(_release, key)
+            return
+        response_body = b"".join(chunks)
+        if 200 <= start["status"] < 300:
+            response_headers = Headers(raw=start["headers"])
+            stored_headers = {name: response_headers[name] for name in STORED_HEADERS if name in response_headers}
+            await run_in_threadpool(_complete, key, StoredResponse(start["status"], response_body, stored_headers))
+        else:
+            await run_in_threadpool(_release, key)
+        await send(start)
+        await send({"type": "http.response.body", "body": response_body, "more_body": False})
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks: List[bytes] = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def _claim(key: str, fingerprint: str) -> Optional[StoredResponse]:
+    with get_session() as session:
+        return idempotency_service.claim(
+            session, key, fingerprint, settings.idempotency_ttl_seconds, settings.idempotency_lock_seconds
+        )
+
+
+def _complete(key: str, response: StoredResponse) -> None:
+    with get_session() as session:
+        idempotency_service.complete(session, key, response)
+
+
+def _release(key: str) -> None:
+    with get_session() as session:
+        idempotency_service.release(session, key)
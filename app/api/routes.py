@@ -1,51 +1,145 @@
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response
-from fastapi.responses import StreamingResponse
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 
-from app.api.deps import enforce_api_token, get_db
+from app.api.deps import (
+    RiskListParams,
+    enforce_api_token,
+    etag_matches,
+    get_db,
+    not_modified,
+    risk_list_params,
+)
 from app.core.config import settings
-from app.schemas.risk import RiskBrief, RiskCreate, RiskPatch, RiskResponse, RiskUpdate
+from app.db.session import get_session
+from app.schemas.risk import (
+    BulkItemResult,
+    BulkResult,
+    ProvenanceRecord,
+    RiskBatchGet,
+    RiskBrief,
+    RiskCreate,
+    RiskListResponse,
+    RiskPatch,
+    RiskResponse,
+    RiskUpdate,
+)
 from app.services import risk_service
 from app.services.export_service import export_csv_stream, export_json_bytes
 
 router = APIRouter()
 
 
-@router.get("/risks", response_model=List[RiskResponse])
+@router.get("/risks", response_model=RiskListResponse, response_class=ORJSONResponse)
 def list_risks(
-    q: Optional[str] = None,
-    min_impact: Optional[int] = Query(default=None, ge=1, le=5),
-    limit: int = Query(default=None, gt=0),
+    params: RiskListParams = Depends(risk_list_params),
+    if_none_match: Optional[str] = Header(default=None),
+    db: Session = Depends(get_db),
+) -> Response:
+    etag = risk_service.get_collection_etag(db, params.filters, params.limit, params.cursor, params.fields)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    try:
+        risks, next_cursor = risk_service.get_risk_page(
+            db,
+            params.filters,
+            limit=params.limit,
+            cursor=params.cursor,
+            fields=params.fields,
+            trusted=True,
+            etag=etag,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return page_response(etag, risks, next_cursor)
+
+
+def page_response(etag: str, risks: List[Any], next_cursor: Optional[str]) -> Response:
+    headers = {"ETag": etag}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    # Cards are validated on write; serialize the rows directly instead of re-validating them.
+    return ORJSONResponse(content=risks, headers=headers)
+
+
+@router.post("/risks/batch-get")
+def batch_get_risks(payload: RiskBatchGet) -> StreamingResponse:
+    """Stream ``{"items": [...], "missing": [...]}`` for the requested ids, in request order."""
+    risk_ids = list(dict.fromkeys(payload.ids))
+    if len(risk_ids) > settings.batch_get_max_ids:
+        raise HTTPException(status_code=413, detail=f"At most {settings.batch_get_max_ids} ids per request")
+    return StreamingResponse(_stream_batch(risk_ids), media_type="application/json")
+
+
+def _stream_batch(risk_ids: List[str]) -> Iterator[bytes]:
+    missing: List[str] = []
+    separator = b""
+    yield b'{"items":['
+    # The request-scoped session is closed before streaming starts, so use a dedicated one.
+    with get_session() as session:
+        for payloads, chunk_missing in risk_service.iter_risk_payloads(
+            session, risk_ids, settings.batch_get_chunk_size
+        ):
+            missing.extend(chunk_missing)
+            for item in payloads:
+                yield separator + orjson.dumps(item)
+                separator = b","
+    yield b'],"missing":' + orjson.dumps(missing) + b"}"
+
+
+@router.get("/risks/brief", response_model=List[RiskBrief])
+def brief_risks(
     ids: Optional[str] = Query(default=None),
-    category: Optional[str] = Query(default=None),
-    lifecycle_stage: Optional[str] = Query(default=None),
-    altai: Optional[str] = Query(default=None, description="Filter by ALTAI requirement id"),
     db: Session = Depends(get_db),
-) -> List[RiskResponse]:
-    limit = limit or settings.default_limit
-    limit = min(limit, settings.max_limit)
-    id_list: Optional[List[str]] = ids.split(",") if ids else None
-    return risk_service.get_risks(
-        db,
-        q=q,
-        min_impact=min_impact,
-        limit=limit,
-        ids=id_list,
-        category=category,
-        lifecycle_stage=lifecycle_stage,
-        altai=altai,
-    )
+) -> List[RiskBrief]:
+    id_list = ids.split(",") if ids else None
+    return risk_service.get_brief(db, id_list)
 
 
 @router.get("/risks/{risk_id}", response_model=RiskResponse)
-def fetch_risk(risk_id: str, db: Session = Depends(get_db)) -> RiskResponse:
+def fetch_risk(
+    risk_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
+    db: Session = Depends(get_db),
+) -> Any:
     try:
-        return risk_service.get_risk(db, risk_id)
+        etag = risk_service.get_risk_etag(db, risk_id)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        risk = risk_service.get_risk(db, risk_id, etag)
     except NoResultFound as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
+    # Tag the body actually returned, in case the row changed after the ETag was read.
+    response.headers["ETag"] = risk_service.risk_etag(risk)
+    return risk
+
+
+@router.get("/risks/{risk_id}/provenance", response_model=List[ProvenanceRecord])
+def risk_provenance(
+    risk_id: str,
+    response: Response,
+    limit: int = Query(default=None, gt=0),
+    cursor: Optional[str] = Query(default=None, description="Opaque cursor from a previous X-Next-Cursor header"),
+    db: Session = Depends(get_db),
+) -> Any:
+    limit = min(limit or settings.default_limit, settings.max_limit)
+    try:
+        records, next_cursor = risk_service.get_provenance_page(db, risk_id, limit=limit, cursor=cursor)
+    except NoResultFound as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return records
 
 
 @router.post("/risks", response_model=RiskResponse, status_code=201, dependencies=[Depends(enforce_api_token)])
@@ -56,28 +150,107 @@ def create_risk(
     return risk_service.create_risk(db, payload, editor=settings.provenance_editor)
 
 
+@router.post("/risks/bulk", response_model=BulkResult, dependencies=[Depends(enforce_api_token)])
+async def bulk_upsert_risks(request: Request, db: Session = Depends(get_db)) -> BulkResult:
+    """Create or replace many risks from a JSON array or an NDJSON (``application/x-ndjson``) body."""
+    body = await request.body()
+    ndjson = request.headers.get("content-type", "").startswith("application/x-ndjson")
+    # Validation and the writes are blocking; keep them off the event loop.
+    return await run_in_threadpool(_bulk_upsert, db, body, ndjson)
+
+
+def _bulk_upsert(db: Session, body: bytes, ndjson: bool) -> BulkResult:
+    try:
+        if ndjson:
+            items = [orjson.loads(line) for line in body.splitlines() if line.strip()]
+        else:
+            items = orjson.loads(body)
+    except orjson.JSONDecodeError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON body: {exc}") from exc
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array of risks")
+    if len(items) > settings.bulk_max_items:
+        raise HTTPException(status_code=413, detail=f"At most {settings.bulk_max_items} risks per request")
+
+    results: List[BulkItemResult] = []
+    valid: List[RiskCreate] = []
+    seen: Dict[str, int] = {}
+    for index, item in enumerate(items):
+        try:
+            payload = RiskCreate.model_validate(item)
+        except ValidationError as exc:
+            errors = [{"loc": list(error["loc"]), "msg": error["msg"]} for error in exc.errors()]
+            risk_id = item.get("risk_id") if isinstance(item, dict) else None
+            if not isinstance(risk_id, str):
+                risk_id = None
+            results.append(BulkItemResult(index=index, risk_id=risk_id, status="invalid", errors=errors))
+            continue
+        if payload.risk_id in seen:
+            message = f"Duplicate of item {seen[payload.risk_id]}"
+            results.append(
+                BulkItemResult(index=index, risk_id=payload.risk_id, status="invalid", errors=[{"msg": message}])
+            )
+            continue
+        seen[payload.risk_id] = index
+        valid.append(payload)
+        results.append(BulkItemResult(index=index, risk_id=payload.risk_id, status="pending"))
+
+    outcome = risk_service.bulk_upsert_risks(
+        db, valid, editor=settings.provenance_editor, chunk_size=settings.bulk_chunk_size
+    )
+    for result in results:
+        if result.status == "pending":
+            result.status = outcome[result.risk_id]
+    statuses = [result.status for result in results]
+    return BulkResult(
+        created=statuses.count("created"),
+        updated=statuses.count("updated"),
+        invalid=statuses.count("invalid"),
+        results=results,
+    )
+
+
 @router.put("/risks/{risk_id}", response_model=RiskResponse, dependencies=[Depends(enforce_api_token)])
 def replace_risk(
     risk_id: str,
     payload: RiskUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
 ) -> RiskResponse:
     try:
-        return risk_service.update_risk(db, risk_id, payload, editor=settings.provenance_editor)
+        risk = risk_service.update_risk(
+            db, risk_id, payload, editor=settings.provenance_editor, if_match=if_match
+        )
     except NoResultFound as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except StaleDataError as exc:
+        raise HTTPException(status_code=412, detail=str(exc)) from exc
+    response.headers["ETag"] = risk_service.risk_etag(risk)
+    return risk
 
 
 @router.patch("/risks/{risk_id}", response_model=RiskResponse, dependencies=[Depends(enforce_api_token)])
 def partial_update_risk(
     risk_id: str,
     payload: RiskPatch,
+    response: Response,
+    if_match: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
 ) -> RiskResponse:
     try:
-        return risk_service.patch_risk(db, risk_id, payload, editor=settings.provenance_editor)
+        risk = risk_service.patch_risk(
+            db, risk_id, payload, editor=settings.provenance_editor, if_match=if_match
+        )
     except NoResultFound as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except StaleDataError as exc:
+        raise HTTPException(status_code=412, detail=str(exc)) from exc
+    except ValidationError as exc:
+        # Raising rolls the UPDATE back along with the request session.
+        raise HTTPException(status_code=422, detail=exc.errors(include_url=False, include_context=False)) from exc
+    response.headers["ETag"] = risk_service.risk_etag(risk)
+    return risk
 
 
 @router.delete("/risks/{risk_id}", status_code=204, dependencies=[Depends(enforce_api_token)])
@@ -87,15 +260,13 @@ def remove_risk(risk_id: str, db: Session = Depends(get_db)) -> Response:
         return Response(status_code=204)
     except NoResultFound as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except StaleDataError as exc:
+        raise HTTPException(status_code=412, detail=str(exc)) from exc
 
 
-@router.get("/risks/brief", response_model=List[RiskBrief])
-def brief_risks(
-    ids: Optional[str] = Query(default=None),
-    db: Session = Depends(get_db),
-) -> List[RiskBrief]:
-    id_list = ids.split(",") if ids else None
-    return risk_service.get_brief(db, id_list)
+@router.get("/cache/stats")
+def read_cache_stats() -> Dict[str, Dict[str, int]]:
+    return risk_service.cache_stats()
 
 
 @router.get("/export/json")
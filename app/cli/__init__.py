@@ -7,7 +7,7 @@ import typer
 from app.cli.review import review_app
 from app.cli.seed import seed_app
 from app.core.config import settings
-from app.services.ingest_pipeline import CsvIngestor, format_lint_issues
+from app.services.ingest_pipeline import CsvIngestor, default_lint_cache_path, format_lint_issues
 
 cli = typer.Typer(help="EnergyGuard Risk DB management commands")
 cli.add_typer(seed_app, name="ingest")
@@ -26,10 +26,15 @@ def lint_command(
         path_type=Path,
         metavar="FILE",
         help="CSV file to validate without ingesting",
-    )
+    ),
+    workers: int = typer.Option(1, "--workers", min=1, help="Processes used to normalize rows"),
+    cache: bool = typer.Option(
+        False, "--cache", help="Reuse results of unchanged rows from FILE.lint-cache and update it"
+    ),
 ) -> None:
-    ingestor = CsvIngestor(editor=settings.provenance_editor)
-    _entries, issues = ingestor.load(file_path)
+    ingestor = CsvIngestor(editor=settings.provenance_editor, workers=workers)
+    cache_path = default_lint_cache_path(file_path) if cache else None
+    _entries, issues = ingestor.load(file_path, cache_path=cache_path, cards=False)
     output = format_lint_issues(issues)
     typer.echo(output.rstrip())
     if issues:
@@ -7,7 +7,8 @@ import typer
 
 from app.core.config import settings
 from app.db.session import get_session
-from app.services.ingest_pipeline import CsvIngestor, format_lint_issues
+from app.services import risk_service
+from app.services.ingest_pipeline import CsvIngestor, default_checkpoint_path, format_lint_issues
 
 seed_app = typer.Typer(help="Seed and ingestion commands")
 
@@ -26,13 +27,51 @@ def canonical_seed(
         help="CSV file containing canonical risks to ingest",
     ),
     provenance_editor: Optional[str] = typer.Option(None, help="Override provenance editor name"),
+    stream: bool = typer.Option(False, "--stream", help="Normalize and commit the file in chunks"),
+    chunk_size: Optional[int] = typer.Option(
+        None, "--chunk-size", min=1, help="Rows per committed chunk in streaming mode"
+    ),
+    resume: bool = typer.Option(False, "--resume", help="Resume a failed streaming run from its checkpoint"),
+    workers: int = typer.Option(1, "--workers", min=1, help="Processes used to normalize rows"),
+    checkpoint: Optional[Path] = typer.Option(
+        None, "--checkpoint", path_type=Path, help="Checkpoint file (defaults to FILE.checkpoint.json)"
+    ),
 ) -> None:
     editor = provenance_editor or settings.provenance_editor
-    ingestor = CsvIngestor(editor=editor)
+    ingestor = CsvIngestor(editor=editor, workers=workers)
+    if stream or resume or chunk_size:
+        checkpoint_path = checkpoint or default_checkpoint_path(file_path)
+        try:
+            result = ingestor.ingest_stream(
+                file_path,
+                get_session,
+                chunk_size or settings.ingest_chunk_size,
+                checkpoint_path,
+                resume=resume,
+            )
+        except ValueError as exc:
+            typer.echo(str(exc))
+            raise typer.Exit(code=1)
+        if result.issues:
+            typer.echo(format_lint_issues(result.issues))
+            typer.echo(
+                f"Stopped after row {result.last_row}; {result.ingested} rows committed ({result.counts.summary()})"
+            )
+            raise typer.Exit(code=1)
+        typer.echo(f"Canonical seed ingestion completed ({result.ingested} rows streamed): {result.counts.summary()}")
+        return
     entries, issues = ingestor.load(file_path)
     if issues:
         typer.echo(format_lint_issues(issues))
         raise typer.Exit(code=1)
     with get_session() as session:
-        ingestor.upsert(session, entries)
-    typer.echo("Canonical seed ingestion completed")
+        counts = ingestor.upsert(session, entries)
+    typer.echo(f"Canonical seed ingestion completed: {counts.summary()}")
+
+
+@seed_app.command("migrate-provenance")
+def migrate_provenance() -> None:
+    """Move provenance lists embedded in existing cards into the risk_provenance table."""
+    with get_session() as session:
+        migrated = risk_service.migrate_card_provenance(session)
+    typer.echo(f"Moved provenance for {migrated} risks")
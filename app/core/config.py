@@ -19,6 +19,20 @@ class Settings(BaseSettings):
     api_token: Optional[str] = Field(default=None)
     provenance_editor: str = Field(default="unknown")
     provenance_domain: Optional[str] = None
+    cache_max_entries: int = 1024
+    cache_ttl_seconds: float = 30.0
+    batch_get_max_ids: int = 50000
+    batch_get_chunk_size: int = 500
+    bulk_max_items: int = 10000
+    bulk_chunk_size: int = 500
+    ingest_chunk_size: int = 500
+    idempotency_ttl_seconds: int = 86400
+    idempotency_lock_seconds: int = 60
+    reference_snapshot_dir: Optional[str] = None
+    vocabulary_path: Optional[str] = None
+    vocabulary_check_seconds: float = 5.0
+    async_db: bool = False
+    async_database_url: Optional[str] = None
 
     model_config = SettingsConfigDict(
         env_file=".env",
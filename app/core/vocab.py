@@ -1,6 +1,17 @@
 from __future__ import annotations
 
-from typing import Dict
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Optional
+
+from app.core.config import settings
+
+VOCABULARY_PATH = Path(__file__).resolve().parents[2] / "data" / "vocabulary.json"
 
 
 def _titleize(identifier: str) -> str:
@@ -137,16 +148,183 @@ ENERGY_CONTEXT_DEFINITIONS: Dict[str, Dict[str, str]] = {
 
 ALLOWED_CONTEXTS = set(ENERGY_CONTEXT_DEFINITIONS.keys())
 
+ALLOWED_IMPACT_DIMENSIONS = {
+    "safety",
+    "reliability",
+    "security",
+    "privacy",
+    "fairness",
+    "compliance",
+    "financial",
+    "reputation",
+    "operational",
+}
+
+REGULATION_ALIASES: Dict[str, str] = {
+    "eu ai act art.9": "EU-AI-Act-Art9",
+    "eu ai act art.13": "EU-AI-Act-Art13",
+    "eu ai act art.14": "EU-AI-Act-Art14",
+    "eu ai act art.15": "EU-AI-Act-Art15",
+    "eu ai act art.52": "EU-AI-Act-Art52",
+    "eu ai act art.53": "EU-AI-Act-Art53",
+    "eu ai act title iii": "EU-AI-Act-TitleIII",
+    "eu ai act title iv": "EU-AI-Act-TitleIV",
+    "eu ai act title ix": "EU-AI-Act-TitleIX",
+    "gdpr": "EU-GDPR",
+    "eu gdpr (2016/679)": "EU-GDPR-2016-679",
+    "ccpa": "US-CCPA",
+    "us ca ccpa (2018)": "US-CCPA-2018",
+    "trade secrets act": "US-Trade-Secrets-Act",
+    "us 18 u.s.c. section 1905": "US-18USC-1905",
+    "justice40 directives": "US-EO-14008",
+    "us executive order 14008": "US-EO-14008",
+    "state utility commission orders": "STATE-UTILITY-COMMISSION-ORDERS",
+    "copyright law": "US-Copyright-Law",
+    "sox itgc": "SOX-ITGC",
+    "sec fair disclosure": "SEC-Fair-Disclosure",
+    "sec 17a-4": "SEC-17A-4",
+    "ferc order 2222": "FERC-Order-2222",
+    "ferc filing mandates": "FERC-Filing-Mandates",
+    "biometric privacy acts": "US-Biometric-Privacy-Acts",
+    "doe cip guidance": "DOE-CIP-Guidance",
+    "doe data privacy order": "DOE-Data-Privacy-Order",
+    "iso 27036": "ISO-27036",
+    "iso/iec 27036": "ISO-27036",
+    "faa part 107": "FAA-Part107",
+    "osha 1910": "OSHA-29CFR-1910",
+}
+
 
 def get_category_display_name(category_id: str) -> str:
-    meta = CATEGORY_DEFINITIONS.get(category_id)
+    meta = current_vocabulary().categories.get(category_id)
     if meta and meta.get("name"):
         return meta["name"]
     return _titleize(category_id)
 
 
 def get_context_display_name(context_id: str) -> str:
-    meta = ENERGY_CONTEXT_DEFINITIONS.get(context_id)
+    meta = current_vocabulary().contexts.get(context_id)
     if meta and meta.get("name"):
         return meta["name"]
     return _titleize(context_id)
+
+
+@dataclass(frozen=True, eq=False)
+class Vocabulary:
+    """One immutable version of the controlled vocabularies."""
+
+    version: str
+    categories: Dict[str, Dict[str, Any]]
+    contexts: Dict[str, Dict[str, Any]]
+    impact_dimensions: FrozenSet[str]
+    regulation_aliases: Dict[str, str]
+
+    @cached_property
+    def allowed_categories(self) -> FrozenSet[str]:
+        return frozenset(self.categories)
+
+    @cached_property
+    def allowed_contexts(self) -> FrozenSet[str]:
+        return frozenset(self.contexts)
+
+
+def build_vocabulary(overrides: Optional[Dict[str, Any]] = None) -> Vocabulary:
+    """Build a vocabulary from the built-in definitions, replacing any section present in ``overrides``."""
+    overrides = overrides or {}
+    sections = {
+        "categories": overrides.get("categories", CATEGORY_DEFINITIONS),
+        "energy_contexts": overrides.get("energy_contexts", ENERGY_CONTEXT_DEFINITIONS),
+        "impact_dimensions": sorted(overrides.get("impact_dimensions", ALLOWED_IMPACT_DIMENSIONS)),
+        "regulation_aliases": overrides.get("regulation_aliases", REGULATION_ALIASES),
+    }
+    canonical = json.dumps(sections, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return Vocabulary(
+        version=hashlib.sha256(canonical).hexdigest()[:16],
+        categories=dict(sections["categories"]),
+        contexts=dict(sections["energy_contexts"]),
+        impact_dimensions=frozenset(sections["impact_dimensions"]),
+        regulation_aliases={key.lower(): value for key, value in sections["regulation_aliases"].items()},
+    )
+
+
+class VocabularyRegistry:
+    """Serve the current vocabulary, reloading it when the override file changes.
+
+    Readers get the whole ``Vocabulary`` object, which is swapped by a single assignment, so a
+    reload never exposes a half-updated set. The file's mtime is checked at most once every
+    ``check_interval`` seconds; subscribers are called after each version change so they can drop
+    lookups derived from the previous version.
+    """
+
+    def __init__(self, path: Optional[Path], check_interval: float = 5.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[Vocabulary], None]] = []
+        self._mtime_ns: Optional[int] = None
+        self._checked_at = 0.0
+        self._vocabulary: Optional[Vocabulary] = None
+
+    @property
+    def version(self) -> str:
+        return self.current().version
+
+    def current(self) -> Vocabulary:
+        vocabulary = self._vocabulary
+        if vocabulary is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return vocabulary
+        return self.reload()
+
+    def reload(self) -> Vocabulary:
+        """Check the override file now and swap in a new version if its contents changed."""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            mtime_ns = self._source_mtime()
+            if self._vocabulary is not None and mtime_ns == self._mtime_ns:
+                return self._vocabulary
+            try:
+                vocabulary = build_vocabulary(self._read_overrides())
+            except (OSError, ValueError, TypeError, AttributeError):
+                # Keep serving the last good version while the file is invalid or mid-write.
+                if self._vocabulary is not None:
+                    return self._vocabulary
+                vocabulary = build_vocabulary()
+            self._mtime_ns = mtime_ns
+            previous = self._vocabulary
+            if previous is not None and previous.version == vocabulary.version:
+                return previous
+            self._vocabulary = vocabulary
+            changed = previous is not None
+        if changed:
+            for listener in list(self._listeners):
+                listener(vocabulary)
+        return vocabulary
+
+    def subscribe(self, listener: Callable[[Vocabulary], None]) -> None:
+        self._listeners.append(listener)
+
+    def _source_mtime(self) -> Optional[int]:
+        if self.path is None:
+            return None
+        try:
+            return self.path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _read_overrides(self) -> Dict[str, Any]:
+        if self.path is None or not self.path.exists():
+            return {}
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        if not isinstance(data, dict):
+            raise ValueError(f"{self.path} must contain a JSON object")
+        return data
+
+
+vocabulary_registry = VocabularyRegistry(
+    Path(settings.vocabulary_path) if settings.vocabulary_path else VOCABULARY_PATH,
+    settings.vocabulary_check_seconds,
+)
+
+
+def current_vocabulary() -> Vocabulary:
+    return vocabulary_registry.current()
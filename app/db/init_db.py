@@ -1,44 +1,75 @@
-from sqlalchemy import inspect
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
 
-from app.core.vocab import CATEGORY_DEFINITIONS, ENERGY_CONTEXT_DEFINITIONS, get_category_display_name, get_context_display_name
-from app.db.models import Base, Category, EnergyContext
-from app.db.session import engine
+from app.core.vocab import Vocabulary, get_category_display_name, get_context_display_name, vocabulary_registry
+from app.db.models import Base, Category, EnergyContext, ensure_risk_indexes
+from app.db import session as session_module
+
+_seeded_version: Optional[str] = None
 
 
 def init_db() -> None:
-    inspector = inspect(engine)
-    Base.metadata.create_all(bind=engine)
-    _seed_reference_tables()
-
-
-def _seed_reference_tables() -> None:
-    with Session(engine) as session:
-        for category_id, meta in CATEGORY_DEFINITIONS.items():
-            if session.get(Category, category_id):
-                continue
-            session.add(
-                Category(
-                    category_id=category_id,
-                    name=get_category_display_name(category_id),
-                    description=meta.get("description"),
-                    parent_category_id=meta.get("parent"),
-                )
-            )
-        for context_id, meta in ENERGY_CONTEXT_DEFINITIONS.items():
-            if session.get(EnergyContext, context_id):
-                continue
-            session.add(
-                EnergyContext(
-                    context_id=context_id,
-                    name=get_context_display_name(context_id),
-                    description=meta.get("description"),
-                    criticality_level=meta.get("criticality", 3),
-                )
-            )
+    Base.metadata.create_all(bind=session_module.engine)
+    with session_module.engine.begin() as connection:
+        ensure_risk_indexes(connection)
+    _seed_reference_tables(vocabulary_registry.current())
+
+
+def refresh_reference_tables() -> bool:
+    """Reload the vocabulary and sync the reference tables if its version changed since the last seed."""
+    vocabulary = vocabulary_registry.reload()
+    if vocabulary.version == _seeded_version:
+        return False
+    _seed_reference_tables(vocabulary)
+    return True
+
+
+def _seed_reference_tables(vocabulary: Vocabulary) -> None:
+    global _seeded_version
+    categories = [
+        {
+            "category_id": category_id,
+            "name": meta.get("name") or get_category_display_name(category_id),
+            "description": meta.get("description"),
+            "parent_category_id": meta.get("parent"),
+        }
+        for category_id, meta in vocabulary.categories.items()
+    ]
+    # Parents first so the self-referencing foreign key is satisfied within the bulk insert.
+    categories.sort(key=lambda row: row["parent_category_id"] is not None)
+    contexts = [
+        {
+            "context_id": context_id,
+            "name": meta.get("name") or get_context_display_name(context_id),
+            "description": meta.get("description"),
+            "criticality_level": meta.get("criticality", 3),
+        }
+        for context_id, meta in vocabulary.contexts.items()
+    ]
+    with Session(session_module.engine) as session:
+        _sync_rows(session, Category, "category_id", categories)
+        _sync_rows(session, EnergyContext, "context_id", contexts)
         session.commit()
+    _seeded_version = vocabulary.version
+
+
+def _sync_rows(session: Session, model: Any, key: str, rows: List[Dict[str, Any]]) -> None:
+    """Insert missing rows and update changed ones with one read of the table and bulk writes."""
+    columns = [getattr(model, name) for name in rows[0]] if rows else []
+    existing = {row[0]: tuple(row) for row in session.execute(select(*columns))} if rows else {}
+    missing = [row for row in rows if row[key] not in existing]
+    changed = [
+        row
+        for row in rows
+        if row[key] in existing and existing[row[key]] != tuple(row.values())
+    ]
+    if missing:
+        session.execute(insert(model), missing)
+    if changed:
+        session.execute(update(model), changed)
 
 
 if __name__ == "__main__":
     init_db()
-
@@ -6,13 +6,22 @@ from sqlalchemy import (
     Index,
     Integer,
     JSON,
+    LargeBinary,
+    MetaData,
     String,
+    Table,
     Text,
+    UniqueConstraint,
+    cast,
     event,
+    func,
+    literal,
+    literal_column,
     text,
 )
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import JSONB, REGCONFIG
 from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy.schema import CreateIndex
 
 Base = declarative_base()
 
@@ -24,12 +33,55 @@ class Risk(Base):
     status = Column(String, nullable=True)
     version = Column(String, nullable=True)
     card = Column(JSONB().with_variant(JSON, "sqlite"), nullable=False)
-    created_at = Column(DateTime, server_default=text("NOW()"), nullable=False)
-    updated_at = Column(DateTime, server_default=text("NOW()"), nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+    # Bumped on every write; ORM updates and deletes check it in their WHERE clause.
+    revision = Column(Integer, nullable=False, default=1, server_default=text("1"))
+    # Fingerprint of the normalized CSV entry the last ingest wrote; API writes clear it so the
+    # next ingest re-applies the row instead of skipping it as unchanged.
+    card_fingerprint = Column(String(64), nullable=True)
 
     categories = relationship("RiskCategory", back_populates="risk", cascade="all, delete-orphan")
     contexts = relationship("RiskContext", back_populates="risk", cascade="all, delete-orphan")
 
+    # eager_defaults fetches the server-side timestamps with RETURNING instead of a SELECT per row.
+    __mapper_args__ = {"version_id_col": revision, "eager_defaults": True}
+
+
+class RiskProvenance(Base):
+    """Append-only provenance history; cards only carry a ``provenance_summary``."""
+
+    __tablename__ = "risk_provenance"
+    __table_args__ = (
+        Index("risk_provenance_risk_id_recorded_at_idx", "risk_id", "recorded_at", "provenance_id"),
+        UniqueConstraint("risk_id", "entry_hash", name="uq_risk_provenance_entry"),
+    )
+
+    provenance_id = Column(Integer, primary_key=True, autoincrement=True)
+    risk_id = Column(String, ForeignKey("risk.risk_id", ondelete="CASCADE"), nullable=False)
+    recorded_at = Column(DateTime, server_default=func.now(), nullable=False)
+    action = Column(String, nullable=True)
+    editor = Column(String, nullable=True)
+    entry_hash = Column(String, nullable=False)
+    entry = Column(JSONB().with_variant(JSON, "sqlite"), nullable=False)
+
+
+class IdempotencyRecord(Base):
+    """Response stored for an ``Idempotency-Key``; ``status_code`` is NULL while the request runs.
+
+    For an unfinished request ``created_at`` is the claim time, which bounds its in-progress lease.
+    """
+
+    __tablename__ = "idempotency_record"
+    __table_args__ = (Index("idempotency_record_created_at_idx", "created_at"),)
+
+    key = Column(String, primary_key=True)
+    request_hash = Column(String, nullable=False)
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(LargeBinary, nullable=True)
+    response_headers = Column(JSONB().with_variant(JSON, "sqlite"), nullable=True)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+
 
 class Category(Base):
     __tablename__ = "category"
@@ -88,6 +140,45 @@ class RiskContext(Base):
 
 risk_card_index = Index("risk_card_gin_idx", Risk.card, postgresql_using="gin", postgresql_ops={"card": "jsonb_path_ops"})
 
+def merge_hash_expression(dialect_name: str):
+    """``card->>'merge_hash'`` spelled exactly as in the matching expression index for ``dialect_name``."""
+    card = Risk.__table__.c.card
+    if dialect_name == "postgresql":
+        return card["merge_hash"].astext
+    # SQLite only matches expression indexes when the JSON path is a literal, not a bound parameter.
+    return func.json_extract(card, literal_column("'$.merge_hash'"))
+
+
+risk_merge_hash_index = Index("risk_card_merge_hash_idx", merge_hash_expression("postgresql")).ddl_if(
+    dialect="postgresql"
+)
+risk_merge_hash_sqlite_index = Index("risk_card_merge_hash_idx", merge_hash_expression("sqlite")).ddl_if(
+    dialect="sqlite"
+)
+
+SEARCH_FIELDS = ("risk_name", "description", "trigger_conditions", "known_mitigations")
+
+
+def _search_document():
+    card = Risk.__table__.c.card
+    document = func.coalesce(card[SEARCH_FIELDS[0]].astext, "")
+    for field in SEARCH_FIELDS[1:]:
+        document = document + " " + func.coalesce(card[field].astext, "")
+    return document
+
+
+# Postgres: expression GIN index over the searchable card fields; queries must reuse this exact expression.
+risk_search_vector = func.to_tsvector(cast(literal("simple"), REGCONFIG), _search_document())
+risk_search_index = Index("risk_search_gin_idx", risk_search_vector, postgresql_using="gin").ddl_if(dialect="postgresql")
+
+# SQLite: FTS5 shadow table kept in sync by triggers (see create_risk_search_table below).
+risk_search_table = Table(
+    "risk_search",
+    MetaData(),
+    Column("risk_id", String),
+    *(Column(field, Text) for field in SEARCH_FIELDS),
+)
+
 
 @event.listens_for(Risk.__table__, "after_create")
 def create_risk_update_trigger(target, connection, **kw):
@@ -125,3 +216,67 @@ def drop_risk_update_trigger(target, connection, **kw):
             """
         )
     )
+
+
+@event.listens_for(Risk.__table__, "after_create")
+def create_risk_search_table(target, connection, **kw):
+    if connection.dialect.name != "sqlite":
+        return
+    columns = ", ".join(SEARCH_FIELDS)
+    values = ", ".join(f"json_extract(new.card, '$.{field}')" for field in SEARCH_FIELDS)
+    existed = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'risk_search'"
+    ).first()
+    connection.exec_driver_sql(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS risk_search USING fts5(risk_id UNINDEXED, {columns})"
+    )
+    if not existed:
+        # Index rows written before the table existed; the triggers below keep it current afterwards.
+        extracted = ", ".join(f"json_extract(card, '$.{field}')" for field in SEARCH_FIELDS)
+        connection.exec_driver_sql(
+            f"INSERT INTO risk_search (risk_id, {columns}) SELECT risk_id, {extracted} FROM risk"
+        )
+    connection.exec_driver_sql(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS risk_search_ai AFTER INSERT ON risk BEGIN
+            INSERT INTO risk_search (risk_id, {columns}) VALUES (new.risk_id, {values});
+        END
+        """
+    )
+    connection.exec_driver_sql(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS risk_search_au AFTER UPDATE OF card ON risk BEGIN
+            DELETE FROM risk_search WHERE risk_id = old.risk_id;
+            INSERT INTO risk_search (risk_id, {columns}) VALUES (new.risk_id, {values});
+        END
+        """
+    )
+    connection.exec_driver_sql(
+        """
+        CREATE TRIGGER IF NOT EXISTS risk_search_ad AFTER DELETE ON risk BEGIN
+            DELETE FROM risk_search WHERE risk_id = old.risk_id;
+        END
+        """
+    )
+
+
+@event.listens_for(Risk.__table__, "after_drop")
+def drop_risk_search_table(target, connection, **kw):
+    if connection.dialect.name != "sqlite":
+        return
+    connection.exec_driver_sql("DROP TABLE IF EXISTS risk_search")
+
+
+def ensure_risk_indexes(connection) -> None:
+    """Create the search objects and expression indexes on a database whose ``risk`` table predates
+    them; safe to repeat.
+
+    ``create_all`` skips both ``after_create`` hooks and new indexes for tables that already exist.
+    """
+    if connection.dialect.name == "postgresql":
+        indexes = [risk_search_index, risk_merge_hash_index]
+    else:
+        indexes = [risk_merge_hash_sqlite_index]
+    for index in indexes:
+        connection.execute(CreateIndex(index, if_not_exists=True))
+    create_risk_search_table(Risk.__table__, connection)
@@ -1,20 +1,51 @@
-from contextlib import contextmanager
-from typing import Generator
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncGenerator, Generator, Optional
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
 
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
 engine = create_engine(settings.database_url, pool_pre_ping=True, future=True)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
 
+# Created on first use so the async drivers are only needed when async mode is enabled.
+async_engine: Optional[AsyncEngine] = None
+AsyncSessionLocal: Optional[async_sessionmaker[AsyncSession]] = None
+
 
 def configure_engine(database_url: str) -> None:
-    global engine, SessionLocal
+    global engine, SessionLocal, async_engine, AsyncSessionLocal
     engine.dispose()
     engine = create_engine(database_url, pool_pre_ping=True, future=True)
     SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
+    if async_engine is not None:
+        async_engine.sync_engine.dispose()
+    async_engine = None
+    AsyncSessionLocal = None
+
+
+def to_async_url(database_url: str) -> str:
+    url = make_url(database_url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for '{url.get_backend_name()}'")
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    global async_engine, AsyncSessionLocal
+    if AsyncSessionLocal is None:
+        async_engine = create_async_engine(
+            settings.async_database_url or to_async_url(engine.url.render_as_string(hide_password=False)),
+            pool_pre_ping=True,
+        )
+        AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+    return AsyncSessionLocal
 
 
 @contextmanager
@@ -28,3 +59,16 @@ def get_session() -> Generator[Session, None, None]:
         raise
     finally:
         session.close()
+
+
+@asynccontextmanager
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    session = get_async_sessionmaker()()
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
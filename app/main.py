@@ -1,29 +1,39 @@
 from __future__ import annotations
 
+from typing import Optional
+
 from apscheduler.schedulers.background import BackgroundScheduler
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api import routes
+from app.api import async_routes, routes
+from app.api.idempotency import IdempotencyMiddleware
 from app.core.config import settings
-from app.db.init_db import init_db
+from app.db.init_db import init_db, refresh_reference_tables
 from app.db.session import get_session
+from app.services import idempotency_service
 from app.services.export_service import export_to_files
 
 scheduler: BackgroundScheduler | None = None
 
 
-def create_app() -> FastAPI:
+def create_app(async_db: Optional[bool] = None) -> FastAPI:
     application = FastAPI(title=settings.app_name)
 
+    # Registered first so CORS (added last, hence outermost) also covers replays and key errors.
+    application.add_middleware(IdempotencyMiddleware)
     application.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # Paging and conditional requests rely on these; browsers hide non-safelisted headers otherwise.
+        expose_headers=["X-Next-Cursor", "ETag"],
     )
 
+    if settings.async_db if async_db is None else async_db:
+        application.include_router(async_routes.router)
     application.include_router(routes.router)
 
     @application.on_event("startup")
@@ -32,6 +42,16 @@ def create_app() -> FastAPI:
         global scheduler
         scheduler = BackgroundScheduler()
         scheduler.add_job(_daily_export_job, "cron", hour=0, minute=0, id="daily_export", replace_existing=True)
+        scheduler.add_job(
+            _purge_idempotency_job, "interval", hours=1, id="purge_idempotency", replace_existing=True
+        )
+        scheduler.add_job(
+            refresh_reference_tables,
+            "interval",
+            seconds=settings.vocabulary_check_seconds,
+            id="refresh_vocabulary",
+            replace_existing=True,
+        )
         scheduler.start()
 
     @application.on_event("shutdown")
@@ -47,4 +67,9 @@ def _daily_export_job() -> None:
         export_to_files(session)
 
 
+def _purge_idempotency_job() -> None:
+    with get_session() as session:
+        idempotency_service.purge_expired(session, settings.idempotency_ttl_seconds)
+
+
 app = create_app()
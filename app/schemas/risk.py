@@ -1,9 +1,18 @@
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 RISK_ID_PATTERN = r"^EG-R-\d{4,}$"
+# Card lists filtered case-insensitively by GET /risks; stored lowercase so JSONB containment matches.
+LOWERCASE_CARD_LISTS = ("categories", "altai_requirements")
+
+
+def lowercase_card_lists(card: Dict[str, Any]) -> Dict[str, Any]:
+    for key in LOWERCASE_CARD_LISTS:
+        if isinstance(card.get(key), list):
+            card[key] = [item.lower() if isinstance(item, str) else item for item in card[key]]
+    return card
 
 
 class RiskCard(BaseModel):
@@ -20,6 +29,7 @@ class RiskCard(BaseModel):
     operational_priority: int = Field(..., ge=1, le=5)
     source_reference: List[str] = Field(default_factory=list)
     provenance: List[Dict[str, Any]] = Field(default_factory=list)
+    provenance_summary: Optional[Dict[str, Any]] = None
     related_risks: List[str] = Field(default_factory=list)
     categories: List[str] = Field(default_factory=list)
     energy_context: List[str] = Field(default_factory=list)
@@ -30,6 +40,10 @@ class RiskCard(BaseModel):
     lifecycle_stage: Optional[str] = None
     risk_summary: Optional[str] = None
 
+    @field_validator(*LOWERCASE_CARD_LISTS)
+    def lowercase_items(cls, v: List[str]) -> List[str]:
+        return [item.lower() for item in v]
+
     @model_validator(mode="after")
     def set_stable_id(self) -> "RiskCard":
         if not self.stable_id:
@@ -63,9 +77,10 @@ class RiskUpdate(BaseModel):
 
 
 class RiskPatch(BaseModel):
-    status: Optional[str]
-    version: Optional[str]
-    card_updates: Optional[Dict[str, Any]]
+    status: Optional[str] = None
+    version: Optional[str] = None
+    # RFC 7396 merge patch applied to the stored card.
+    card_updates: Optional[Dict[str, Any]] = None
 
     @field_validator("card_updates")
     def ensure_updates(cls, v: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
@@ -79,12 +94,51 @@ class RiskResponse(BaseModel):
     card: RiskCard
     created_at: datetime
     updated_at: datetime
+    revision: int
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class RiskProjection(BaseModel):
+    risk_id: str
+    status: Optional[str]
+    version: Optional[str]
+    card: Dict[str, Any]
+
+
+# GET /risks returns full risks, or projections when ``fields`` is set.
+RiskListResponse = Union[List[RiskResponse], List[RiskProjection]]
+
+PROJECTABLE_CARD_FIELDS = frozenset(RiskCard.model_fields)
+
+
+class ProvenanceRecord(BaseModel):
+    recorded_at: datetime
+    action: Optional[str] = None
+    editor: Optional[str] = None
+    entry: Dict[str, Any]
+
+
 class RiskBrief(BaseModel):
     risk_id: str
     risk_name: str
     impact_level: int
     impact_dimensions: List[str]
+
+
+class RiskBatchGet(BaseModel):
+    ids: List[str] = Field(..., min_length=1)
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    risk_id: Optional[str] = None
+    status: str
+    errors: List[Dict[str, Any]] = Field(default_factory=list)
+
+
+class BulkResult(BaseModel):
+    created: int
+    updated: int
+    invalid: int
+    results: List[BulkItemResult]
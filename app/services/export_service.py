@@ -7,6 +7,7 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, Iterable, Iterator, List
 
+import orjson
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
@@ -21,9 +22,9 @@ def _ensure_export_dir() -> Path:
 
 
 def export_json_bytes(session: Session) -> bytes:
-    risks = session.execute(select(Risk)).scalars().all()
-    data = [dict(risk.card, risk_id=risk.risk_id, status=risk.status, version=risk.version) for risk in risks]
-    return json.dumps(data, default=str, indent=2).encode()
+    rows = session.execute(select(Risk.risk_id, Risk.status, Risk.version, Risk.card)).all()
+    data = [dict(card, risk_id=risk_id, status=status, version=version) for risk_id, status, version, card in rows]
+    return orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2)
 
 
 def export_csv_stream(session: Session) -> Iterator[str]:
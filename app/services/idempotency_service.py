@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.db.models import IdempotencyRecord
+
+
+class IdempotencyKeyInUse(Exception):
+    """The key belongs to a request that has not finished yet."""
+
+
+class IdempotencyKeyMismatch(Exception):
+    """The key was already used for a different request."""
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    status_code: int
+    body: bytes
+    headers: Dict[str, str]
+
+
+def request_fingerprint(method: str, path: str, body: bytes, api_key: Optional[str]) -> str:
+    # The API key is part of the fingerprint so a key cannot be used to read another client's response.
+    digest = hashlib.sha256()
+    for part in (method.encode(), path.encode(), (api_key or "").encode(), body):
+        digest.update(hashlib.sha256(part).digest())
+    return digest.hexdigest()
+
+
+def claim(
+    session: Session,
+    key: str,
+    fingerprint: str,
+    ttl_seconds: int,
+    lock_seconds: int,
+    now: Optional[datetime] = None,
+) -> Optional[StoredResponse]:
+    """Reserve ``key`` for this request, or return the response stored for an earlier one.
+
+    Raises ``IdempotencyKeyMismatch`` if the key was used for a different request and
+    ``IdempotencyKeyInUse`` while the original request is still running. A claim that has been
+    in progress for more than ``lock_seconds`` is assumed to have died with its process and is
+    taken over.
+    """
+    now = now or datetime.utcnow()
+    record = session.get(IdempotencyRecord, key)
+    if record is not None and record.created_at <= now - timedelta(seconds=ttl_seconds):
+        session.delete(record)
+        session.flush()
+        record = None
+    if record is None:
+        session.add(IdempotencyRecord(key=key, request_hash=fingerprint, created_at=now))
+        try:
+            session.flush()
+        except IntegrityError as exc:
+            # A concurrent request claimed the key first; the caller rolls this session back.
+            raise IdempotencyKeyInUse(key) from exc
+        return None
+    if record.request_hash != fingerprint:
+        raise IdempotencyKeyMismatch(key)
+    if record.status_code is None:
+        if record.created_at > now - timedelta(seconds=lock_seconds):
+            raise IdempotencyKeyInUse(key)
+        # Only one retry may take the lease over; the claim time doubles as its version.
+        taken = session.execute(
+            update(IdempotencyRecord)
+            .where(
+                IdempotencyRecord.key == key,
+                IdempotencyRecord.status_code.is_(None),
+                IdempotencyRecord.created_at == record.created_at,
+            )
+            .values(created_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        if taken.rowcount != 1:
+            raise IdempotencyKeyInUse(key)
+        return None
+    return StoredResponse(record.status_code, record.response_body or b"", dict(record.response_headers or {}))
+
+
+def complete(session: Session, key: str, response: StoredResponse) -> None:
+    record = session.get(IdempotencyRecord, key)
+    if record is None:
+        return
+    record.status_code = response.status_code
+    record.response_body = response.body
+    record.response_headers = response.headers
+
+
+def release(session: Session, key: str) -> None:
+    """Drop an unfinished claim so the client can retry with the same key."""
+    session.execute(
+        delete(IdempotencyRecord).where(IdempotencyRecord.key == key, IdempotencyRecord.status_code.is_(None))
+    )
+
+
+def purge_expired(session: Session, ttl_seconds: int, now: Optional[datetime] = None) -> int:
+    cutoff = (now or datetime.utcnow()) - timedelta(seconds=ttl_seconds)
+    result = session.execute(delete(IdempotencyRecord).where(IdempotencyRecord.created_at < cutoff))
+    return result.rowcount or 0
@@ -1,35 +1,67 @@
 from __future__ import annotations
 
+import bisect
+import copy
 import csv
+import hashlib
 import io
 import json
 import math
 import os
 import re
+import sqlite3
 import urllib.request
 from collections import OrderedDict
-from dataclasses import dataclass
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import closing, contextmanager
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
+import orjson
 import yaml
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.core.vocab import ALLOWED_CATEGORIES, ALLOWED_CONTEXTS
-from app.db.models import EnergyContext, Risk
+from app.core.config import settings
+from app.core.vocab import Vocabulary, current_vocabulary, vocabulary_registry
+from app.db.models import EnergyContext, Risk, merge_hash_expression
 from app.schemas.risk import RiskCard, RiskCreate, RiskUpdate
 from app.services import risk_service
+from app.services.reference_data import ReferenceRegistry
 
 ROOT_DIR = Path(__file__).resolve().parents[2]
 DATA_DIR = ROOT_DIR / "data"
 ATLAS_TECHNIQUES_PATH = ROOT_DIR / "atlas_techniques.yaml"
 RISK_ATLAS_NEXUS_CACHE = DATA_DIR / "risk_atlas_nexus_mappings.json"
+ALTAI_REQUIREMENTS_PATH = DATA_DIR / "altai_requirements.json"
+ALTAI_MAPPING_PATH = DATA_DIR / "altai_risk_mapping.csv"
+MIT_AIRISK_IDS_PATH = DATA_DIR / "mit_airisk_ids.txt"
+AIID_IDS_PATH = DATA_DIR / "aiid_incidents.txt"
 RISK_ATLAS_NEXUS_SOURCES = {
     "nexus": "https://raw.githubusercontent.com/IBM/risk-atlas-nexus/main/src/risk_atlas_nexus/data/knowledge_graph/mappings/mit-ai-risk-repository_ibm-risk-atlas_from_tsv_data.yaml",
     "nist": "https://raw.githubusercontent.com/IBM/risk-atlas-nexus/main/src/risk_atlas_nexus/data/knowledge_graph/mappings/ibm2nistgenai_from_tsv_data.yaml",
 }
 REFRESH_RISK_ATLAS = os.getenv("REFRESH_RISK_ATLAS_NEXUS", "").lower() in {"1", "true", "yes"}
+UPSERT_PREFETCH_CHUNK = 500
+NORMALIZE_CHUNK = 1000
+TOKEN_CACHE_SIZE = 4096
+# Bump when row normalization changes so existing lint caches are discarded.
+LINT_CACHE_FORMAT = 2
 
 REQUIRED_COLUMNS = {
     "risk_id",
@@ -52,18 +84,6 @@ REQUIRED_COLUMNS = {
     "version",
 }
 
-ALLOWED_IMPACT_DIMENSIONS = {
-    "safety",
-    "reliability",
-    "security",
-    "privacy",
-    "fairness",
-    "compliance",
-    "financial",
-    "reputation",
-    "operational",
-}
-
 IMPACT_DIMENSION_MAP = {
     "grid_stability": "reliability",
     "stability": "reliability",
@@ -89,40 +109,6 @@ ALLOWED_SOURCE_PREFIXES = {
     "US",
 }
 
-REGULATION_ALIASES = {
-    "eu ai act art.9": "EU-AI-Act-Art9",
-    "eu ai act art.13": "EU-AI-Act-Art13",
-    "eu ai act art.14": "EU-AI-Act-Art14",
-    "eu ai act art.15": "EU-AI-Act-Art15",
-    "eu ai act art.52": "EU-AI-Act-Art52",
-    "eu ai act art.53": "EU-AI-Act-Art53",
-    "eu ai act title iii": "EU-AI-Act-TitleIII",
-    "eu ai act title iv": "EU-AI-Act-TitleIV",
-    "eu ai act title ix": "EU-AI-Act-TitleIX",
-    "gdpr": "EU-GDPR",
-    "eu gdpr (2016/679)": "EU-GDPR-2016-679",
-    "ccpa": "US-CCPA",
-    "us ca ccpa (2018)": "US-CCPA-2018",
-    "trade secrets act": "US-Trade-Secrets-Act",
-    "us 18 u.s.c. section 1905": "US-18USC-1905",
-    "justice40 directives": "US-EO-14008",
-    "us executive order 14008": "US-EO-14008",
-    "state utility commission orders": "STATE-UTILITY-COMMISSION-ORDERS",
-    "copyright law": "US-Copyright-Law",
-    "sox itgc": "SOX-ITGC",
-    "sec fair disclosure": "SEC-Fair-Disclosure",
-    "sec 17a-4": "SEC-17A-4",
-    "ferc order 2222": "FERC-Order-2222",
-    "ferc filing mandates": "FERC-Filing-Mandates",
-    "biometric privacy acts": "US-Biometric-Privacy-Acts",
-    "doe cip guidance": "DOE-CIP-Guidance",
-    "doe data privacy order": "DOE-Data-Privacy-Order",
-    "iso 27036": "ISO-27036",
-    "iso/iec 27036": "ISO-27036",
-    "faa part 107": "FAA-Part107",
-    "osha 1910": "OSHA-29CFR-1910",
-}
-
 REGULATION_PATTERNS: Sequence[Tuple[re.Pattern[str], str]] = (
     (re.compile(r"eu[\\s-]*ai[\\s-]*act.*title\s*([ivx]+)", re.IGNORECASE), "EU-AI-Act-Title{title}"),
     (re.compile(r"eu[\\s-]*ai[\\s-]*act.*art(?:icle)?\.?\s*(\d+)", re.IGNORECASE), "EU-AI-Act-Art{article}"),
@@ -156,6 +142,30 @@ REGULATION_PATTERNS: Sequence[Tuple[re.Pattern[str], str]] = (
     ),
 )
 
+# Each REGULATION_PATTERNS entry needs one of these keywords to match, so only the patterns for
+# keywords found in a token are tried (still in their original order).
+REGULATION_PATTERN_KEYWORDS: Sequence[Tuple[str, ...]] = (
+    ("eu",),
+    ("eu",),
+    ("eu",),
+    ("eu",),
+    ("nerc",),
+    ("nerc",),
+    ("iec", "iso"),
+    ("nist",),
+    ("nist",),
+)
+REGULATION_DISPATCH: Dict[str, Tuple[int, ...]] = {
+    keyword: tuple(index for index, keywords in enumerate(REGULATION_PATTERN_KEYWORDS) if keyword in keywords)
+    for keyword in {keyword for keywords in REGULATION_PATTERN_KEYWORDS for keyword in keywords}
+}
+REGULATION_KEYWORD_PATTERN = re.compile(
+    "(?=" + "|".join(f"(?P<{keyword}>{keyword})" for keyword in sorted(REGULATION_DISPATCH)) + ")",
+    re.IGNORECASE,
+)
+REGULATION_KEY_PATTERN = re.compile(r"[^\w]+")
+SOURCE_REFERENCE_PATTERN = re.compile(r"\s*([A-Za-z0-9_\-]+)\s*:\s*(.+)")
+
 
 @dataclass
 class LintIssue:
@@ -174,6 +184,167 @@ class NormalizedRisk:
     card: Dict[str, Any]
 
 
+@dataclass
+class IngestCheckpoint:
+    """Progress of a streaming ingest: the source file hash and the last committed CSV row."""
+
+    file_hash: str
+    last_row: int
+
+    @classmethod
+    def read(cls, path: Path) -> Optional["IngestCheckpoint"]:
+        if not path.exists():
+            return None
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return cls(file_hash=data["file_hash"], last_row=int(data["last_row"]))
+
+    def write(self, path: Path) -> None:
+        # Write then rename so a crash never leaves a truncated checkpoint behind.
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps({"file_hash": self.file_hash, "last_row": self.last_row}), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+RowResult = Tuple[Optional[NormalizedRisk], List[LintIssue]]
+# Cached (issues, risk_id, related_risks) of one row: enough to lint without reading its card back.
+RowSummary = Tuple[List[LintIssue], Optional[str], List[str]]
+
+
+class LintCache:
+    """Per-row normalization results of one CSV in an SQLite file, keyed by a hash of the row's content.
+
+    Results are only reused under the ``version`` (reference data plus CSV header) they were computed
+    with; opening the cache with another version empties it. Cards are stored as JSON next to a small
+    summary of each row and are only read back for callers that need the entries. JSON rather than
+    pickle, so loading a cache file from elsewhere cannot run code.
+    """
+
+    def __init__(self, path: Path, version: str):
+        try:
+            self.connection = self._open(path, version)
+        except sqlite3.DatabaseError:
+            # Not a cache file (or a corrupt one): start over.
+            path.unlink()
+            self.connection = self._open(path, version)
+
+    @staticmethod
+    def _open(path: Path, version: str) -> sqlite3.Connection:
+        connection = sqlite3.connect(path)
+        with connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS meta (version TEXT NOT NULL)")
+            # Summaries and cards live in separate tables so reading every summary stays a small scan.
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS row_summary "
+                "(key BLOB PRIMARY KEY, issues BLOB, risk_id TEXT, related_risks TEXT) WITHOUT ROWID"
+            )
+            connection.execute("CREATE TABLE IF NOT EXISTS row_entry (key BLOB PRIMARY KEY, entry BLOB NOT NULL)")
+            stored = connection.execute("SELECT version FROM meta").fetchone()
+            if stored is None or stored[0] != version:
+                connection.execute("DELETE FROM meta")
+                connection.execute("DELETE FROM row_summary")
+                connection.execute("DELETE FROM row_entry")
+                connection.execute("INSERT INTO meta (version) VALUES (?)", (version,))
+        return connection
+
+    def summaries(self) -> Dict[bytes, RowSummary]:
+        return {
+            key: (
+                [LintIssue(**issue) for issue in orjson.loads(issues)] if issues else [],
+                risk_id,
+                related.split(";") if related else [],
+            )
+            for key, issues, risk_id, related in self.connection.execute(
+                "SELECT key, issues, risk_id, related_risks FROM row_summary"
+            )
+        }
+
+    def entries(self) -> Dict[bytes, NormalizedRisk]:
+        return {
+            key: NormalizedRisk(**orjson.loads(entry))
+            for key, entry in self.connection.execute("SELECT key, entry FROM row_entry")
+        }
+
+    def update(self, fresh: Dict[bytes, RowResult], stale: Iterable[bytes]) -> None:
+        summaries = [
+            (
+                key,
+                orjson.dumps(issues) if issues else None,
+                entry.risk_id if entry else None,
+                ";".join(entry.card.get("related_risks", [])) if entry else None,
+            )
+            for key, (entry, issues) in fresh.items()
+        ]
+        entries = [
+            (key, orjson.dumps(entry))
+            for key, (entry, _issues) in fresh.items()
+            if entry is not None
+        ]
+        stale_keys = [(key,) for key in stale]
+        with self.connection:
+            self.connection.executemany("DELETE FROM row_summary WHERE key = ?", stale_keys)
+            self.connection.executemany("DELETE FROM row_entry WHERE key = ?", stale_keys)
+            self.connection.executemany("INSERT OR REPLACE INTO row_summary VALUES (?, ?, ?, ?)", summaries)
+            self.connection.executemany("INSERT OR REPLACE INTO row_entry VALUES (?, ?)", entries)
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+@dataclass
+class UpsertResult:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    def add(self, other: "UpsertResult") -> None:
+        self.inserted += other.inserted
+        self.updated += other.updated
+        self.unchanged += other.unchanged
+
+    def summary(self) -> str:
+        return f"{self.inserted} inserted, {self.updated} updated, {self.unchanged} unchanged"
+
+
+@dataclass
+class StreamResult:
+    ingested: int
+    last_row: int
+    issues: List[LintIssue]
+    counts: UpsertResult = field(default_factory=UpsertResult)
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def card_fingerprint(entry: NormalizedRisk) -> str:
+    """Content fingerprint of a normalized entry, stored on the row so unchanged entries can be skipped."""
+    content = {"risk_id": entry.risk_id, "status": entry.status, "version": entry.version, "card": entry.card}
+    return hashlib.sha256(json.dumps(content, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+def default_checkpoint_path(file_path: Path) -> Path:
+    return file_path.with_name(file_path.name + ".checkpoint.json")
+
+
+def default_lint_cache_path(file_path: Path) -> Path:
+    return file_path.with_name(file_path.name + ".lint-cache")
+
+
+def _row_key(row: Dict[str, str]) -> bytes:
+    try:
+        # Column names are part of the cache version, so the values alone identify the row.
+        content = "\x1f".join(row.values())
+    except TypeError:
+        # Short rows hold None values and long ones a list under the None key.
+        content = repr(list(row.items()))
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+
+
 def _load_id_list(path: Path) -> Set[str]:
     if not path.exists():
         return set()
@@ -257,7 +428,45 @@ def _load_risk_atlas_nexus() -> Dict[str, Dict[str, List[str]]]:
     return normalized
 
 
-RISK_ATLAS_NEXUS = _load_risk_atlas_nexus()
+class AtlasNameIndex:
+    """Precomputed lookups for matching a risk-name slug against Risk Atlas ids.
+
+    An atlas id matches when either slug is a suffix of the other, or when they share enough
+    hyphen-separated tokens. Suffix matches come from a dict of atlas slugs plus a sorted list of
+    reversed slugs; token matches only consider ids from the token-to-id inverted index.
+    """
+
+    def __init__(self, atlas_ids: Iterable[str]):
+        self.by_slug: Dict[str, List[str]] = {}
+        self.tokens: Dict[str, Set[str]] = {}
+        self.by_token: Dict[str, Set[str]] = {}
+        for atlas_id in atlas_ids:
+            atlas_slug = atlas_id.replace("atlas-", "")
+            self.by_slug.setdefault(atlas_slug, []).append(atlas_id)
+            self.tokens[atlas_id] = set(atlas_slug.split("-"))
+            for token in self.tokens[atlas_id]:
+                self.by_token.setdefault(token, set()).add(atlas_id)
+        self.reversed_slugs = sorted((atlas_slug[::-1], atlas_slug) for atlas_slug in self.by_slug)
+
+    def match(self, slug: str) -> List[str]:
+        matches: Set[str] = set()
+        # Atlas slugs that are a suffix of ``slug`` (including equality and the empty slug).
+        for start in range(len(slug) + 1):
+            matches.update(self.by_slug.get(slug[start:], ()))
+        # Atlas slugs that end with ``slug``: their reversals share the reversed slug as a prefix.
+        reversed_slug = slug[::-1]
+        position = bisect.bisect_left(self.reversed_slugs, (reversed_slug,))
+        while position < len(self.reversed_slugs) and self.reversed_slugs[position][0].startswith(reversed_slug):
+            matches.update(self.by_slug[self.reversed_slugs[position][1]])
+            position += 1
+        slug_tokens = set(slug.split("-"))
+        candidates = set().union(*(self.by_token.get(token, ()) for token in slug_tokens)) - matches
+        for atlas_id in candidates:
+            atlas_tokens = self.tokens[atlas_id]
+            shared = atlas_tokens & slug_tokens
+            if len(shared) >= max(1, min(len(atlas_tokens), len(slug_tokens)) - 1):
+                matches.add(atlas_id)
+        return sorted(matches)
 
 
 def _load_altai_requirements(path: Path) -> Set[str]:
@@ -290,13 +499,49 @@ def _load_altai_mapping(path: Path, allowed: Set[str]) -> Dict[str, List[str]]:
     return mapping
 
 
-ALTAI_REQUIREMENTS = _load_altai_requirements(DATA_DIR / "altai_requirements.json")
-ALTAI_MAPPING = _load_altai_mapping(DATA_DIR / "altai_risk_mapping.csv", ALTAI_REQUIREMENTS)
+# Reference catalogs are loaded on first use (from a snapshot when their sources are unchanged),
+# so importing this module does no file parsing and never downloads the Risk Atlas mappings.
+reference_data = ReferenceRegistry(
+    Path(settings.reference_snapshot_dir) if settings.reference_snapshot_dir else DATA_DIR / ".snapshots"
+)
+reference_data.register(
+    "risk_atlas_nexus", [RISK_ATLAS_NEXUS_CACHE], _load_risk_atlas_nexus, use_snapshot=not REFRESH_RISK_ATLAS
+)
+reference_data.register(
+    "atlas_name_index",
+    [RISK_ATLAS_NEXUS_CACHE],
+    lambda: AtlasNameIndex(reference_data.get("risk_atlas_nexus").keys()),
+    use_snapshot=not REFRESH_RISK_ATLAS,
+)
+reference_data.register(
+    "altai_requirements", [ALTAI_REQUIREMENTS_PATH], lambda: _load_altai_requirements(ALTAI_REQUIREMENTS_PATH)
+)
+reference_data.register(
+    "altai_mapping",
+    [ALTAI_REQUIREMENTS_PATH, ALTAI_MAPPING_PATH],
+    lambda: _load_altai_mapping(ALTAI_MAPPING_PATH, reference_data.get("altai_requirements")),
+)
+reference_data.register("mit_airisk_ids", [MIT_AIRISK_IDS_PATH], lambda: _load_id_list(MIT_AIRISK_IDS_PATH))
+reference_data.register(
+    "aiid_ids", [AIID_IDS_PATH], lambda: {item.upper() for item in _load_id_list(AIID_IDS_PATH)}
+)
+reference_data.register("mitre_atlas_ids", [ATLAS_TECHNIQUES_PATH], _load_mitre_atlas_ids)
+
+
+def atlas_name_index() -> AtlasNameIndex:
+    return reference_data.get("atlas_name_index")
+
+
+def reference_version() -> str:
+    """Version of everything row normalization reads besides the row itself (vocabulary and catalogs)."""
+    parts = f"{LINT_CACHE_FORMAT}|{current_vocabulary().version}|{reference_data.version()}"
+    return hashlib.sha256(parts.encode("utf-8")).hexdigest()[:16]
 
 
-MIT_AIRISK_IDS = _load_id_list(DATA_DIR / "mit_airisk_ids.txt")
-AIID_IDS = {item.upper() for item in _load_id_list(DATA_DIR / "aiid_incidents.txt")}
-MITRE_ATLAS_IDS = _load_mitre_atlas_ids()
+def reload_reference_data() -> None:
+    """Drop loaded catalogs and the token caches that were computed from them."""
+    reference_data.invalidate()
+    map_source_reference.cache_clear()
 
 AIID_PATTERN = re.compile(r"INC-\d{3,}", re.IGNORECASE)
 MIT_AIRISK_PATTERN = re.compile(r"[a-z0-9][a-z0-9_\-\.]*$")
@@ -304,54 +549,394 @@ MIT_AIRISK_PATTERN = re.compile(r"[a-z0-9][a-z0-9_\-\.]*$")
 
 def _is_valid_source(prefix: str, identifier: str) -> bool:
     if prefix == "MITRE_ATLAS":
-        if MITRE_ATLAS_IDS:
-            return identifier.upper() in MITRE_ATLAS_IDS
+        mitre_atlas_ids = reference_data.get("mitre_atlas_ids")
+        if mitre_atlas_ids:
+            return identifier.upper() in mitre_atlas_ids
         return identifier.upper().startswith("AML.")
     if prefix == "AIID":
         identifier_upper = identifier.upper()
-        if AIID_IDS:
-            return identifier_upper in AIID_IDS
+        aiid_ids = reference_data.get("aiid_ids")
+        if aiid_ids:
+            return identifier_upper in aiid_ids
         return bool(AIID_PATTERN.fullmatch(identifier_upper))
     if prefix == "MIT_AIRISK":
         identifier_lower = identifier.lower()
-        if MIT_AIRISK_IDS:
-            return identifier_lower in MIT_AIRISK_IDS
+        mit_airisk_ids = reference_data.get("mit_airisk_ids")
+        if mit_airisk_ids:
+            return identifier_lower in mit_airisk_ids
         return bool(MIT_AIRISK_PATTERN.fullmatch(identifier_lower))
     return True
 
 
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def normalize_regulation_token(token: str) -> str:
+    """Map one regulation token to its canonical id (memoized by raw token)."""
+    key = REGULATION_KEY_PATTERN.sub(" ", token).strip().lower()
+    mapped = current_vocabulary().regulation_aliases.get(key)
+    if not mapped:
+        mapped = _apply_regulation_patterns(token)
+    if not mapped:
+        mapped = REGULATION_KEY_PATTERN.sub("-", token.strip()).upper()
+    return mapped
+
+
+def _apply_regulation_patterns(token: str) -> Optional[str]:
+    keywords = {match.lastgroup for match in REGULATION_KEYWORD_PATTERN.finditer(token)}
+    candidates = sorted({index for keyword in keywords for index in REGULATION_DISPATCH[keyword]})
+    for index in candidates:
+        pattern, template = REGULATION_PATTERNS[index]
+        match = pattern.search(token)
+        if not match:
+            continue
+        if "{year}" in template:
+            year, code = match.group(1), match.group(2)
+            if "TITLE" in template:
+                title = match.group(3).upper()
+                return template.format(year=year, code=code, title=title)
+            if "ART" in template:
+                article = match.group(3)
+                return template.format(year=year, code=code, article=article)
+        elif "{family}" in template and match.lastindex:
+            family = match.group(1).upper()
+            code = match.group(2)
+            if match.lastindex >= 3 and match.group(3):
+                version = match.group(3)
+                return template.format(family=family, code=code, version=version)
+            return template.format(family=family, code=code)
+        elif "{org}" in template:
+            org = "IEC" if token.lower().startswith("iec") else "ISO"
+            code = match.group(1)
+            return template.format(org=org, code=code)
+        elif "{major}" in template:
+            major = match.group(1)
+            minor = match.group(2)
+            extra = ""
+            if match.lastindex and match.lastindex >= 3:
+                extra_val = match.group(3)
+                extra = f"-{extra_val}" if extra_val else ""
+            rev = ""
+            if match.lastindex and match.lastindex >= 4:
+                rev_val = match.group(4) or ""
+                rev_val = rev_val.replace(" ", "")
+                rev = f"-{rev_val}" if rev_val else ""
+            return template.format(major=major, minor=minor, extra=extra, rev=rev)
+        elif "{article}" in template:
+            article = match.group(1)
+            return template.format(article=article)
+        elif "{title}" in template:
+            title = match.group(1).upper()
+            return template.format(title=title)
+    return None
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def map_source_reference(token: str) -> Optional[str]:
+    """Normalize and validate one ``PREFIX:identifier`` source reference (memoized by raw token)."""
+    token = token.strip()
+    if not token:
+        return None
+    match = SOURCE_REFERENCE_PATTERN.match(token)
+    if not match:
+        return None
+    prefix_raw, body_raw = match.groups()
+    prefix = prefix_raw.upper()
+    if prefix not in ALLOWED_SOURCE_PREFIXES:
+        return None
+    body = body_raw.strip()
+    if not body:
+        return None
+    if prefix == "IEEE":
+        if not body.upper().startswith("DOI:"):
+            body = f"DOI:{body}"
+    elif prefix in {"MITRE_ATLAS", "AIID"}:
+        body = body.upper()
+    elif prefix in {"NERC", "FERC", "NIST"}:
+        body = body.upper()
+    elif prefix == "OSHA":
+        body = body.replace(" ", "")
+    elif prefix == "FAA":
+        body = body.replace(" ", "")
+    elif prefix == "MIT_AIRISK":
+        body = body.strip().lower()
+    elif prefix == "NASA":
+        body = body.upper()
+    elif prefix == "US":
+        body = body.upper()
+    normalized = f"{prefix}:{body}"
+    if not _is_valid_source(prefix, body):
+        return None
+    return normalized
+
+
+# Regulation tokens are memoized against the alias table of the vocabulary that was current then.
+vocabulary_registry.subscribe(lambda _vocabulary: normalize_regulation_token.cache_clear())
+
+
+def _normalize_chunk(editor: str, rows: List[Tuple[int, Dict[str, str]]]) -> Tuple[List[NormalizedRisk], List[LintIssue]]:
+    """Process-pool entry point: normalize one ordered chunk of rows."""
+    return CsvIngestor(editor=editor)._normalize_rows(rows)
+
+
 class CsvIngestor:
-    def __init__(self, editor: str):
+    def __init__(self, editor: str, workers: int = 1):
         self.editor = editor
-
-    def load(self, file_path: Path) -> Tuple[List[NormalizedRisk], List[LintIssue]]:
+        self.workers = workers
+        self._category_suggestions: Dict[Tuple[str, str], Optional[str]] = {}
+
+    def load(
+        self, file_path: Path, cache_path: Optional[Path] = None, cards: bool = True
+    ) -> Tuple[List[NormalizedRisk], List[LintIssue]]:
+        """Normalize and validate ``file_path``.
+
+        With ``cache_path``, per-row results are kept on disk and only rows whose content changed
+        since the previous run are normalized again; the cross-row relationship check always reruns.
+        ``cards=False`` is for callers that only need the issues (see ``_normalize_rows_cached``).
+        """
         raw_rows, header_issues = self._read_csv(file_path)
         if header_issues:
             return [], header_issues
+        if cache_path is not None:
+            entries, issues = self._normalize_rows_cached(raw_rows, cache_path, cards)
+        else:
+            with self._worker_pool() as pool:
+                entries, issues = self._normalize_rows(raw_rows, pool)
+        if not issues:
+            self._ensure_relationships(entries, issues)
+        return entries, issues
+
+    def ingest_stream(
+        self,
+        file_path: Path,
+        session_scope: Callable[[], ContextManager[Session]],
+        chunk_size: int,
+        checkpoint_path: Path,
+        resume: bool = False,
+    ) -> StreamResult:
+        """Normalize and upsert ``file_path`` in chunks of ``chunk_size`` rows, committing each chunk.
+
+        After every commit the checkpoint is rewritten, so a failed run can be resumed with
+        ``resume=True``; it is removed once the whole file has been ingested. Related-risk links
+        are resolved in a cheap first pass over the ``risk_id``/``related_risks`` columns, and the
+        run stops before the first chunk that has lint issues.
+        """
+        file_hash = file_sha256(file_path)
+        start_after = 0
+        if resume:
+            checkpoint = IngestCheckpoint.read(checkpoint_path)
+            if checkpoint is not None:
+                if checkpoint.file_hash != file_hash:
+                    raise ValueError(f"Checkpoint {checkpoint_path} was recorded for a different version of {file_path}")
+                start_after = checkpoint.last_row
+        backlinks, issues = self._scan_relationships(file_path)
+        if issues:
+            return StreamResult(ingested=0, last_row=start_after, issues=issues)
+
+        ingested = 0
+        counts = UpsertResult()
+        rows, _header_issues = self._iter_csv(file_path)
+        with self._worker_pool() as pool:
+            for chunk in self._chunks(rows, chunk_size, start_after):
+                issues, chunk_counts = self._ingest_chunk(chunk, backlinks, session_scope, pool)
+                if issues:
+                    return StreamResult(ingested=ingested, last_row=start_after, issues=issues, counts=counts)
+                counts.add(chunk_counts)
+                ingested += len(chunk)
+                start_after = chunk[-1][0]
+                IngestCheckpoint(file_hash=file_hash, last_row=start_after).write(checkpoint_path)
+        checkpoint_path.unlink(missing_ok=True)
+        return StreamResult(ingested=ingested, last_row=start_after, issues=[], counts=counts)
+
+    def _chunks(
+        self, rows: Iterable[Tuple[int, Dict[str, str]]], chunk_size: int, start_after: int
+    ) -> Iterator[List[Tuple[int, Dict[str, str]]]]:
+        chunk: List[Tuple[int, Dict[str, str]]] = []
+        for row_num, row in rows:
+            if row_num <= start_after:
+                continue
+            chunk.append((row_num, row))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _ingest_chunk(
+        self,
+        chunk: List[Tuple[int, Dict[str, str]]],
+        backlinks: Dict[str, Set[str]],
+        session_scope: Callable[[], ContextManager[Session]],
+        pool: Optional[Executor] = None,
+    ) -> Tuple[List[LintIssue], UpsertResult]:
+        entries, issues = self._normalize_rows(chunk, pool)
+        if issues:
+            return issues, UpsertResult()
+        for entry in entries:
+            incoming = backlinks.get(entry.risk_id)
+            if incoming:
+                entry.card["related_risks"] = self._sort_list(set(entry.card.get("related_risks", [])) | incoming)
+        with session_scope() as session:
+            counts = self.upsert(session, entries)
+        return [], counts
+
+    def _scan_relationships(self, file_path: Path) -> Tuple[Dict[str, Set[str]], List[LintIssue]]:
+        """Streaming equivalent of ``_ensure_relationships``: map each risk to the risks that reference it."""
+        rows, issues = self._iter_csv(file_path)
+        if issues:
+            return {}, issues
+        known: Set[str] = set()
+        references: List[Tuple[int, str, List[str]]] = []
+        for row_num, row in rows:
+            risk_id = row.get("risk_id", "").strip()
+            known.add(risk_id)
+            related = self._normalize_related_risks(row.get("related_risks", ""))
+            if related:
+                references.append((row_num, risk_id, related))
+        backlinks: Dict[str, Set[str]] = {}
+        for row_num, risk_id, related in references:
+            for rel in related:
+                if rel not in known:
+                    issues.append(LintIssue(row=row_num, field="related_risks", error=f"Unknown related risk '{rel}'"))
+                    continue
+                backlinks.setdefault(rel, set()).add(risk_id)
+        return backlinks, issues
+
+    @contextmanager
+    def _worker_pool(self) -> Iterator[Optional[Executor]]:
+        if self.workers <= 1:
+            yield None
+            return
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            yield pool
+
+    def _normalize_rows(
+        self, raw_rows: Iterable[Tuple[int, Dict[str, str]]], pool: Optional[Executor] = None
+    ) -> Tuple[List[NormalizedRisk], List[LintIssue]]:
         entries: List[NormalizedRisk] = []
         issues: List[LintIssue] = []
+        if pool is not None:
+            # Rows are normalized independently; map() keeps chunk order, so merging the
+            # results in sequence gives the same entries and issues as the serial path.
+            rows = list(raw_rows)
+            size = max(1, min(NORMALIZE_CHUNK, math.ceil(len(rows) / self.workers)))
+            chunks = [rows[start : start + size] for start in range(0, len(rows), size)]
+            for chunk_entries, chunk_issues in pool.map(_normalize_chunk, repeat(self.editor), chunks):
+                entries.extend(chunk_entries)
+                issues.extend(chunk_issues)
+            return entries, issues
         for row_num, row in raw_rows:
             normalized, row_issues = self._normalize_row(row_num, row)
             if row_issues:
                 issues.extend(row_issues)
             if normalized and not row_issues:
                 entries.append(normalized)
-        if not issues:
-            self._ensure_relationships(entries, issues)
         return entries, issues
 
-    def upsert(self, session: Session, entries: Sequence[NormalizedRisk]) -> None:
+    def _normalize_rows_cached(
+        self, raw_rows: Iterable[Tuple[int, Dict[str, str]]], cache_path: Path, cards: bool = True
+    ) -> Tuple[List[NormalizedRisk], List[LintIssue]]:
+        """Normalize only rows missing from the cache at ``cache_path`` and reuse the rest.
+
+        With ``cards=False`` the entries of cached rows only carry ``risk_id`` and ``related_risks``
+        (enough for ``_ensure_relationships``), so their cards are never read back.
+        """
+        keyed = [(row_num, row, _row_key(row)) for row_num, row in raw_rows]
+        header = "\x1f".join(str(column) for column in keyed[0][1]) if keyed else ""
+        version = f"{reference_version()}:{hashlib.blake2b(header.encode('utf-8'), digest_size=8).hexdigest()}"
+        with closing(LintCache(cache_path, version)) as cache:
+            summaries = cache.summaries()
+            misses = [(row_num, row) for row_num, row, key in keyed if key not in summaries]
+            fresh_by_row: Dict[int, RowResult] = {}
+            if misses:
+                with self._worker_pool() as pool:
+                    miss_entries, miss_issues = self._normalize_rows(misses, pool)
+                # Every entry and issue carries its row number, so the flat results split back per row.
+                issues_by_row: Dict[int, List[LintIssue]] = {}
+                for issue in miss_issues:
+                    issues_by_row.setdefault(issue.row, []).append(issue)
+                entries_by_row = {entry.row: entry for entry in miss_entries}
+                fresh_by_row = {
+                    row_num: (entries_by_row.get(row_num), issues_by_row.get(row_num, [])) for row_num, _ in misses
+                }
+            current_keys = {key for _, _, key in keyed}
+            fresh = {key: fresh_by_row[row_num] for row_num, _, key in keyed if row_num in fresh_by_row}
+            if fresh or len(current_keys) != len(summaries):
+                cache.update(fresh, [key for key in summaries if key not in current_keys])
+            cached_entries = cache.entries() if cards and len(fresh_by_row) < len(keyed) else {}
+
+        entries: List[NormalizedRisk] = []
+        issues: List[LintIssue] = []
+        reused: Set[bytes] = set()
+        for row_num, _row, key in keyed:
+            entry: Optional[NormalizedRisk]
+            if row_num in fresh_by_row:
+                entry, row_issues = fresh_by_row[row_num]
+            else:
+                cached_issues, risk_id, related_risks = summaries[key]
+                # Rows may have moved since they were cached.
+                row_issues = [
+                    issue if issue.row == row_num else replace(issue, row=row_num) for issue in cached_issues
+                ]
+                if risk_id is None:
+                    entry = None
+                elif cards:
+                    # Identical rows share a key, so each one needs its own copy of the card.
+                    entry = cached_entries[key]
+                    if key in reused:
+                        entry = copy.deepcopy(entry)
+                    reused.add(key)
+                    entry.row = row_num
+                else:
+                    entry = NormalizedRisk(row_num, risk_id, "", "", {"related_risks": list(related_risks)})
+            issues.extend(row_issues)
+            if entry is not None and not row_issues:
+                entries.append(entry)
+        return entries, issues
+
+    def upsert(self, session: Session, entries: Sequence[NormalizedRisk]) -> UpsertResult:
+        """Create or merge ``entries``, skipping those whose fingerprint matches the one stored by the last ingest.
+
+        Stored fingerprints are compared in bulk first, so unchanged rows are neither loaded nor rewritten
+        (no provenance entry, revision bump or ``updated_at`` change). The stored provenance of the targets
+        is loaded once and the batch's new entries are inserted together after the risks.
+        """
+        result = UpsertResult()
+        stored = self._stored_fingerprints(session, [entry.risk_id for entry in entries])
+        pending: List[Tuple[NormalizedRisk, str]] = []
         for entry in entries:
+            fingerprint = card_fingerprint(entry)
+            if stored.get(entry.risk_id) == fingerprint:
+                result.unchanged += 1
+            else:
+                pending.append((entry, fingerprint))
+        if not pending:
+            return result
+
+        by_id, by_hash = self._prefetch_targets(session, [entry for entry, _ in pending])
+        provenance = risk_service.load_provenance_batch(
+            session, [risk.risk_id for targets in (by_id, by_hash) for risk in targets.values()]
+        )
+        context_ids = {context_id for entry, _ in pending for context_id in entry.card.get("energy_context", [])}
+        known_context_ids = set(
+            self._select_in(session, EnergyContext.context_id, EnergyContext.context_id, context_ids)
+        )
+        category_links: Dict[str, List[str]] = {}
+        context_links: Dict[str, List[Dict[str, Any]]] = {}
+        # Risks created by this batch are only loaded again if a later entry merges into them;
+        # reloading each one after its INSERT would cost a SELECT per row.
+        created_ids: Set[str] = set()
+        created_hashes: Dict[str, str] = {}
+        for entry, fingerprint in pending:
             card_payload = dict(entry.card)
             card_payload["stable_id"] = entry.risk_id
             risk_card = RiskCard(**card_payload)
-            target = session.get(Risk, entry.risk_id)
-            if not target:
-                target = (
-                    session.execute(select(Risk).where(Risk.card["merge_hash"].astext == entry.card["merge_hash"]))
-                    .scalars()
-                    .first()
-                )
+            target = by_id.get(entry.risk_id) or by_hash.get(entry.card["merge_hash"])
+            if target is None and (entry.risk_id in created_ids or entry.card["merge_hash"] in created_hashes):
+                created_id = entry.risk_id if entry.risk_id in created_ids else created_hashes[entry.card["merge_hash"]]
+                target = by_id[created_id] = session.get(Risk, created_id)
+            if target and target.card_fingerprint == fingerprint:
+                # Matched by merge_hash and already applied by a previous ingest.
+                result.unchanged += 1
+                continue
             if target:
                 merged = self._merge_cards(dict(target.card), entry.card)
                 merged["stable_id"] = target.risk_id
@@ -360,8 +945,17 @@ class CsvIngestor:
                     version=entry.version or target.version,
                     card=RiskCard(**merged),
                 )
-                risk_service.update_risk(session, target.risk_id, update_payload, editor=self.editor)
+                risk_service.update_risk(
+                    session,
+                    target.risk_id,
+                    update_payload,
+                    editor=self.editor,
+                    card_fingerprint=fingerprint,
+                    sync_links=False,
+                    provenance=provenance,
+                )
                 risk_id = target.risk_id
+                result.updated += 1
             else:
                 create_payload = RiskCreate(
                     risk_id=entry.risk_id,
@@ -369,31 +963,73 @@ class CsvIngestor:
                     version=entry.version,
                     card=risk_card,
                 )
-                risk_service.create_risk(session, create_payload, editor=self.editor)
-                risk_id = entry.risk_id
-            risk_service.set_categories(session, risk_id=risk_id, category_ids=entry.card.get("categories", []))
-            context_ids = entry.card.get("energy_context", [])
-            if context_ids:
-                existing_context_ids = (
-                    session.execute(
-                        select(EnergyContext.context_id).where(EnergyContext.context_id.in_(context_ids))
-                    ).scalars().all()
+                risk_service.create_risk(
+                    session,
+                    create_payload,
+                    editor=self.editor,
+                    card_fingerprint=fingerprint,
+                    sync_links=False,
+                    provenance=provenance,
                 )
-            else:
-                existing_context_ids = []
-            context_refs = [
+                risk_id = entry.risk_id
+                result.inserted += 1
+                created_ids.add(risk_id)
+                created_hashes.setdefault(entry.card["merge_hash"], risk_id)
+            if target:
+                by_hash.setdefault(target.card.get("merge_hash"), target)
+            category_links[risk_id] = entry.card.get("categories", [])
+            context_links[risk_id] = [
                 {"context_id": context_id, "exposure_level": 3}
-                for context_id in existing_context_ids
+                for context_id in entry.card.get("energy_context", [])
+                if context_id in known_context_ids
             ]
-            risk_service.set_contexts(session, risk_id=risk_id, context_refs=context_refs)
+        session.flush()
+        risk_service.insert_provenance_batch(session, provenance)
+        risk_service.sync_categories(session, category_links)
+        risk_service.sync_contexts(session, context_links)
+        return result
+
+    def _stored_fingerprints(self, session: Session, risk_ids: Sequence[str]) -> Dict[str, Optional[str]]:
+        stored: Dict[str, Optional[str]] = {}
+        for start in range(0, len(risk_ids), UPSERT_PREFETCH_CHUNK):
+            chunk = risk_ids[start : start + UPSERT_PREFETCH_CHUNK]
+            rows = session.execute(select(Risk.risk_id, Risk.card_fingerprint).where(Risk.risk_id.in_(chunk)))
+            stored.update((risk_id, fingerprint) for risk_id, fingerprint in rows)
+        return stored
+
+    def _prefetch_targets(
+        self, session: Session, entries: Sequence[NormalizedRisk]
+    ) -> Tuple[Dict[str, Risk], Dict[str, Risk]]:
+        """Load every existing risk an entry could merge into, by id and then by merge_hash."""
+        risk_ids = [entry.risk_id for entry in entries]
+        by_id = {risk.risk_id: risk for risk in self._select_in(session, Risk, Risk.risk_id, risk_ids)}
+        hashes = {entry.card["merge_hash"] for entry in entries if entry.risk_id not in by_id}
+        merge_hash = merge_hash_expression(session.get_bind().dialect.name)
+        by_hash: Dict[str, Risk] = {}
+        for risk in sorted(self._select_in(session, Risk, merge_hash, hashes), key=lambda risk: risk.risk_id):
+            by_hash.setdefault(risk.card.get("merge_hash"), risk)
+        return by_id, by_hash
+
+    def _select_in(self, session: Session, entity: Any, column: Any, values: Iterable[Any]) -> List[Any]:
+        values = list(values)
+        results: List[Any] = []
+        for start in range(0, len(values), UPSERT_PREFETCH_CHUNK):
+            chunk = values[start : start + UPSERT_PREFETCH_CHUNK]
+            results.extend(session.execute(select(entity).where(column.in_(chunk))).scalars())
+        return results
 
     def _read_csv(self, file_path: Path) -> Tuple[List[Tuple[int, Dict[str, str]]], List[LintIssue]]:
+        rows, issues = self._iter_csv(file_path)
+        return list(rows), issues
+
+    def _iter_csv(self, file_path: Path) -> Tuple[Iterator[Tuple[int, Dict[str, str]]], List[LintIssue]]:
+        """Check the header and return a lazy iterator over ``(row_number, row)`` pairs."""
         issues: List[LintIssue] = []
         with file_path.open("r", encoding="utf-8") as handle:
             reader = csv.DictReader(handle)
             if reader.fieldnames is None:
                 issues.append(LintIssue(row=0, field="header", error="Missing header row"))
-                return [], issues
+                return iter(()), issues
             missing = REQUIRED_COLUMNS - set(reader.fieldnames)
             if missing:
                 issues.append(
@@ -403,9 +1039,14 @@ class CsvIngestor:
                         error=f"Missing required columns: {', '.join(sorted(missing))}",
                     )
                 )
-                return [], issues
-            rows = [(index + 2, row) for index, row in enumerate(reader)]
-        return rows, issues
+                return iter(()), issues
+
+        def rows() -> Iterator[Tuple[int, Dict[str, str]]]:
+            with file_path.open("r", encoding="utf-8") as handle:
+                for index, row in enumerate(csv.DictReader(handle)):
+                    yield index + 2, row
+
+        return rows(), issues
 
     def _normalize_row(self, row_num: int, row: Dict[str, str]) -> Tuple[Optional[NormalizedRisk], List[LintIssue]]:
         issues: List[LintIssue] = []
@@ -544,13 +1185,14 @@ class CsvIngestor:
         return result
 
     def _augment_provenance_from_mappings(self, card: Dict[str, Any]) -> None:
-        if not RISK_ATLAS_NEXUS:
+        risk_atlas_nexus = reference_data.get("risk_atlas_nexus")
+        if not risk_atlas_nexus:
             return
         atlas_matches = self._guess_atlas_matches(card.get("risk_name", ""))
         if not atlas_matches:
             return
         for atlas_id in atlas_matches:
-            mapping = RISK_ATLAS_NEXUS.get(atlas_id, {})
+            mapping = risk_atlas_nexus.get(atlas_id, {})
             entry: Dict[str, Any] = {
                 "action": "mapped",
                 "sources": [f"IBM_RISK_ATLAS:{atlas_id}"],
@@ -566,7 +1208,7 @@ class CsvIngestor:
             card.setdefault("provenance", []).append(entry)
 
     def _apply_altai_mapping(self, risk_id: str, card: Dict[str, Any]) -> None:
-        altai_ids = ALTAI_MAPPING.get(risk_id)
+        altai_ids = reference_data.get("altai_mapping").get(risk_id)
         if not altai_ids:
             return
         merged = self._sort_list(set(card.get("altai_requirements", [])) | set(altai_ids))
@@ -579,19 +1221,7 @@ class CsvIngestor:
         card.setdefault("provenance", []).append(provenance_entry)
 
     def _guess_atlas_matches(self, risk_name: str) -> List[str]:
-        slug = self._slugify(risk_name)
-        matches: List[str] = []
-        for atlas_id in RISK_ATLAS_NEXUS.keys():
-            atlas_slug = atlas_id.replace("atlas-", "")
-            if slug == atlas_slug or slug.endswith(atlas_slug) or atlas_slug.endswith(slug):
-                matches.append(atlas_id)
-                continue
-            atlas_tokens = set(atlas_slug.split("-"))
-            slug_tokens = set(slug.split("-"))
-            shared = atlas_tokens & slug_tokens
-            if shared and len(shared) >= max(1, min(len(atlas_tokens), len(slug_tokens)) - 1):
-                matches.append(atlas_id)
-        return sorted(set(matches))
+        return atlas_name_index().match(self._slugify(risk_name))
 
     def _slugify(self, value: str) -> str:
         value = value.lower()
@@ -629,7 +1259,7 @@ class CsvIngestor:
         normalized: List[str] = []
         for token in tokens:
             mapped = IMPACT_DIMENSION_MAP.get(token, token)
-            if mapped not in ALLOWED_IMPACT_DIMENSIONS:
+            if mapped not in current_vocabulary().impact_dimensions:
                 issues.append(
                     LintIssue(
                         row=row,
@@ -649,64 +1279,9 @@ class CsvIngestor:
         tokens = [token.strip() for token in value.split(";") if token.strip()]
         normalized: List[str] = []
         for token in tokens:
-            key = re.sub(r"[^\w]+", " ", token).strip().lower()
-            mapped = REGULATION_ALIASES.get(key)
-            if not mapped:
-                mapped = self._apply_regulation_patterns(token)
-            if not mapped:
-                mapped = self._fallback_regulation(token)
-            normalized.append(mapped)
+            normalized.append(normalize_regulation_token(token))
         return self._sort_list(normalized)
 
-    def _apply_regulation_patterns(self, token: str) -> Optional[str]:
-        for pattern, template in REGULATION_PATTERNS:
-            match = pattern.search(token)
-            if not match:
-                continue
-            if "{year}" in template:
-                year, code = match.group(1), match.group(2)
-                if "TITLE" in template:
-                    title = match.group(3).upper()
-                    return template.format(year=year, code=code, title=title)
-                if "ART" in template:
-                    article = match.group(3)
-                    return template.format(year=year, code=code, article=article)
-            elif "{family}" in template and match.lastindex:
-                family = match.group(1).upper()
-                code = match.group(2)
-                if match.lastindex >= 3 and match.group(3):
-                    version = match.group(3)
-                    return template.format(family=family, code=code, version=version)
-                return template.format(family=family, code=code)
-            elif "{org}" in template:
-                org = "IEC" if token.lower().startswith("iec") else "ISO"
-                code = match.group(1)
-                return template.format(org=org, code=code)
-            elif "{major}" in template:
-                major = match.group(1)
-                minor = match.group(2)
-                extra = ""
-                if match.lastindex and match.lastindex >= 3:
-                    extra_val = match.group(3)
-                    extra = f"-{extra_val}" if extra_val else ""
-                rev = ""
-                if match.lastindex and match.lastindex >= 4:
-                    rev_val = match.group(4) or ""
-                    rev_val = rev_val.replace(" ", "")
-                    rev = f"-{rev_val}" if rev_val else ""
-                return template.format(major=major, minor=minor, extra=extra, rev=rev)
-            elif "{article}" in template:
-                article = match.group(1)
-                return template.format(article=article)
-            elif "{title}" in template:
-                title = match.group(1).upper()
-                return template.format(title=title)
-        return None
-
-    def _fallback_regulation(self, token: str) -> str:
-        cleaned = re.sub(r"[^\w]+", "-", token.strip())
-        return cleaned.upper()
-
     def _normalize_source_references(self, value: str, row: int) -> Tuple[List[str], List[LintIssue]]:
         tokens = [token.strip() for token in value.split(";") if token.strip()]
         normalized: List[str] = []
@@ -726,40 +1301,7 @@ class CsvIngestor:
         return self._sort_list(normalized), issues
 
     def _map_source_reference(self, token: str) -> Optional[str]:
-        token = token.strip()
-        if not token:
-            return None
-        match = re.match(r"\s*([A-Za-z0-9_\-]+)\s*:\s*(.+)", token)
-        if not match:
-            return None
-        prefix_raw, body_raw = match.groups()
-        prefix = prefix_raw.upper()
-        if prefix not in ALLOWED_SOURCE_PREFIXES:
-            return None
-        body = body_raw.strip()
-        if not body:
-            return None
-        if prefix == "IEEE":
-            if not body.upper().startswith("DOI:"):
-                body = f"DOI:{body}"
-        elif prefix in {"MITRE_ATLAS", "AIID"}:
-            body = body.upper()
-        elif prefix in {"NERC", "FERC", "NIST"}:
-            body = body.upper()
-        elif prefix == "OSHA":
-            body = body.replace(" ", "")
-        elif prefix == "FAA":
-            body = body.replace(" ", "")
-        elif prefix == "MIT_AIRISK":
-            body = body.strip().lower()
-        elif prefix == "NASA":
-            body = body.upper()
-        elif prefix == "US":
-            body = body.upper()
-        normalized = f"{prefix}:{body}"
-        if not _is_valid_source(prefix, body):
-            return None
-        return normalized
+        return map_source_reference(token)
 
     def _normalize_provenance(self, value: str, normalized_sources: List[str]) -> List[Dict[str, Any]]:
         entries = [token.strip() for token in value.split(";") if token.strip()]
@@ -816,11 +1358,12 @@ class CsvIngestor:
         tokens = [token.strip() for token in value.split(";") if token.strip()]
         normalized: List[str] = []
         issues: List[LintIssue] = []
+        vocabulary = current_vocabulary()
         for token in tokens:
-            if token in ALLOWED_CATEGORIES:
+            if token in vocabulary.allowed_categories:
                 normalized.append(token)
             else:
-                suggestion = self._suggest(token, ALLOWED_CATEGORIES)
+                suggestion = self._suggest_category(vocabulary, token)
                 issues.append(
                     LintIssue(
                         row=row,
@@ -835,8 +1378,9 @@ class CsvIngestor:
         tokens = [token.strip() for token in value.split(";") if token.strip()]
         normalized: List[str] = []
         issues: List[LintIssue] = []
+        allowed_contexts = current_vocabulary().allowed_contexts
         for token in tokens:
-            if token not in ALLOWED_CONTEXTS:
+            if token not in allowed_contexts:
                 issues.append(
                     LintIssue(
                         row=row,
@@ -898,6 +1442,12 @@ class CsvIngestor:
             ordered.setdefault(key.lower(), key.strip())
         return [ordered[key] for key in sorted(ordered)]
 
+    def _suggest_category(self, vocabulary: Vocabulary, token: str) -> Optional[str]:
+        key = (vocabulary.version, token)
+        if key not in self._category_suggestions:
+            self._category_suggestions[key] = self._suggest(token, vocabulary.allowed_categories)
+        return self._category_suggestions[key]
+
     def _suggest(self, token: str, candidates: Iterable[str]) -> Optional[str]:
         token_lower = token.lower()
         closest: Optional[str] = None
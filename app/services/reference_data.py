@@ -0,0 +1,169 @@
+"""Lazily loaded reference catalogs backed by on-disk snapshots.
+
+A catalog is built by a loader from one or more source files. The first ``get`` in a process reads
+a pickled snapshot of the built value when the fingerprints recorded with it (mtime and size, then
+sha256 when those differ) still match the sources; otherwise the loader runs and the snapshot is
+rewritten. Nothing is loaded when the module is imported.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Bump when the shape of a snapshotted value changes so older snapshots are rebuilt.
+SNAPSHOT_FORMAT = 1
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class SourceFingerprint:
+    path: str
+    mtime_ns: int
+    size: int
+    sha256: str
+
+
+@dataclass
+class ReferenceCatalog:
+    name: str
+    sources: Tuple[Path, ...]
+    loader: Callable[[], Any]
+    use_snapshot: bool = True
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _fingerprint(path: Path) -> Optional[SourceFingerprint]:
+    try:
+        stat = path.stat()
+        return SourceFingerprint(str(path), stat.st_mtime_ns, stat.st_size, _sha256(path))
+    except OSError:
+        return None
+
+
+def _still_matches(recorded: SourceFingerprint, path: Path) -> bool:
+    if recorded.path != str(path):
+        return False
+    try:
+        stat = path.stat()
+        if stat.st_mtime_ns == recorded.mtime_ns and stat.st_size == recorded.size:
+            return True
+        # Touched but possibly unchanged (e.g. a fresh checkout): fall back to the content hash.
+        return stat.st_size == recorded.size and _sha256(path) == recorded.sha256
+    except OSError:
+        return False
+
+
+class ReferenceRegistry:
+    def __init__(self, snapshot_dir: Optional[Path] = None):
+        self.snapshot_dir = snapshot_dir
+        self._catalogs: Dict[str, ReferenceCatalog] = {}
+        self._values: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self.stats: Dict[str, int] = {"snapshot": 0, "built": 0}
+
+    def register(
+        self,
+        name: str,
+        sources: Iterable[Path],
+        loader: Callable[[], Any],
+        *,
+        use_snapshot: bool = True,
+    ) -> None:
+        with self._lock:
+            self._catalogs[name] = ReferenceCatalog(name, tuple(sources), loader, use_snapshot)
+            self._values.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        value = self._values.get(name, _MISSING)
+        if value is not _MISSING:
+            return value
+        with self._lock:
+            value = self._values.get(name, _MISSING)
+            if value is not _MISSING:
+                return value
+            catalog = self._catalogs[name]
+            value = self._read_snapshot(catalog) if catalog.use_snapshot else _MISSING
+            if value is _MISSING:
+                value = catalog.loader()
+                self.stats["built"] += 1
+                self._write_snapshot(catalog, value)
+            else:
+                self.stats["snapshot"] += 1
+            self._values[name] = value
+            return value
+
+    def version(self) -> str:
+        """Fingerprint of every registered source file; it changes whenever one of them is edited."""
+        digest = hashlib.sha256()
+        for name in sorted(self._catalogs):
+            for source in self._catalogs[name].sources:
+                try:
+                    stat = source.stat()
+                    digest.update(f"{name}|{source}|{stat.st_mtime_ns}|{stat.st_size}\n".encode("utf-8"))
+                except OSError:
+                    digest.update(f"{name}|{source}|missing\n".encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def loaded(self) -> List[str]:
+        return sorted(self._values)
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Forget loaded values so the next ``get`` re-checks the snapshot against its sources."""
+        with self._lock:
+            if name is None:
+                self._values.clear()
+            else:
+                self._values.pop(name, None)
+
+    def snapshot_path(self, name: str) -> Optional[Path]:
+        if self.snapshot_dir is None:
+            return None
+        return self.snapshot_dir / f"{name}.pickle"
+
+    def _read_snapshot(self, catalog: ReferenceCatalog) -> Any:
+        path = self.snapshot_path(catalog.name)
+        if path is None or not path.exists():
+            return _MISSING
+        try:
+            with path.open("rb") as handle:
+                snapshot = pickle.load(handle)
+            if snapshot["format"] != SNAPSHOT_FORMAT or len(snapshot["sources"]) != len(catalog.sources):
+                return _MISSING
+            for recorded, source in zip(snapshot["sources"], catalog.sources):
+                if not _still_matches(recorded, source):
+                    return _MISSING
+            return snapshot["value"]
+        except Exception:
+            return _MISSING
+
+    def _write_snapshot(self, catalog: ReferenceCatalog, value: Any) -> None:
+        path = self.snapshot_path(catalog.name)
+        if path is None:
+            return
+        fingerprints = [_fingerprint(source) for source in catalog.sources]
+        # A missing source leaves nothing to validate against; rebuild on the next process instead.
+        if any(fingerprint is None for fingerprint in fingerprints):
+            return
+        snapshot = {"format": SNAPSHOT_FORMAT, "sources": fingerprints, "value": value}
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with tmp_path.open("wb") as handle:
+                pickle.dump(snapshot, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception:
+            pass
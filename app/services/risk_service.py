@@ -1,17 +1,59 @@
 from __future__ import annotations
 
+import base64
+import binascii
 import hashlib
 import json
+import math
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, Iterable, List, Optional, Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
 
-from sqlalchemy import Text, cast, func, select
+from sqlalchemy import (
+    ColumnElement,
+    Integer,
+    Row,
+    Select,
+    Text,
+    and_,
+    bindparam,
+    case,
+    cast,
+    delete,
+    event,
+    exists,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.dialects.postgresql import array as postgresql_array
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import NoResultFound
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 
-from app.schemas.risk import RiskBrief, RiskCard, RiskCreate, RiskPatch, RiskResponse, RiskUpdate
+from app.schemas.risk import (
+    PROJECTABLE_CARD_FIELDS,
+    RiskBrief,
+    RiskCard,
+    RiskCreate,
+    RiskPatch,
+    RiskProjection,
+    RiskResponse,
+    RiskUpdate,
+    lowercase_card_lists,
+)
 from app.core.config import settings
-from app.db.models import Risk, RiskCategory, RiskContext
+from app.db.models import Category, EnergyContext, Risk, RiskCategory, RiskContext, RiskProvenance
+from app.services import search_service
+from app.services.read_cache import MISSING, ReadCache
 
 
 def _ensure_stable_id(card: Dict[str, Any], risk_id: str) -> Dict[str, Any]:
@@ -19,17 +61,377 @@ def _ensure_stable_id(card: Dict[str, Any], risk_id: str) -> Dict[str, Any]:
     return card
 
 
-def _append_provenance(card: Dict[str, Any], action: str, editor: Optional[str] = None) -> None:
-    provenance = card.setdefault("provenance", [])
-    if provenance and isinstance(provenance[0], str):
-        card["provenance"] = [{"note": entry} for entry in provenance if entry]
-        provenance = card["provenance"]
-    provenance_entry = {
+def _provenance_entry(action: str, editor: Optional[str] = None) -> Dict[str, Any]:
+    return {
         "action": action,
         "editor": editor or settings.provenance_editor,
         "timestamp": datetime.utcnow().isoformat(),
     }
-    provenance.append(provenance_entry)
+
+
+def _provenance_row(risk_id: str, entry: Dict[str, Any], recorded_at: datetime) -> Dict[str, Any]:
+    return {
+        "risk_id": risk_id,
+        "recorded_at": recorded_at,
+        "action": entry.get("action"),
+        "editor": entry.get("editor"),
+        "entry_hash": hashlib.sha256(json.dumps(entry, sort_keys=True, default=str).encode()).hexdigest(),
+        "entry": entry,
+    }
+
+
+def _provenance_summary(count: int, last: Dict[str, Any], recorded_at: datetime) -> Dict[str, Any]:
+    return {
+        "count": count,
+        "last_editor": last.get("editor"),
+        "last_action": last.get("action"),
+        "last_recorded_at": recorded_at.isoformat(),
+    }
+
+
+def _card_provenance(card: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"note": entry} if isinstance(entry, str) else entry for entry in card.get("provenance") or [] if entry]
+
+
+@dataclass
+class ProvenanceBatch:
+    """Stored provenance of a batch of risks, loaded once, plus the rows its writes still have to insert."""
+
+    counts: Dict[str, int]
+    seen: Set[Tuple[str, str]]
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def load_provenance_batch(session: Session, risk_ids: Iterable[str]) -> ProvenanceBatch:
+    """Load the stored entry hashes of ``risk_ids`` for writes that pass ``provenance=`` and insert at the end."""
+    risk_ids = sorted(set(risk_ids))
+    batch = ProvenanceBatch(counts={}, seen=set())
+    for start in range(0, len(risk_ids), LINK_SYNC_CHUNK):
+        chunk = risk_ids[start : start + LINK_SYNC_CHUNK]
+        stmt = select(RiskProvenance.risk_id, RiskProvenance.entry_hash).where(RiskProvenance.risk_id.in_(chunk))
+        for risk_id, entry_hash in session.execute(stmt):
+            batch.counts[risk_id] = batch.counts.get(risk_id, 0) + 1
+            batch.seen.add((risk_id, entry_hash))
+    return batch
+
+
+def insert_provenance_batch(session: Session, batch: ProvenanceBatch) -> None:
+    """Insert the rows collected in ``batch`` with one executemany, once its risks have been flushed."""
+    _insert_provenance(session, batch.rows)
+    batch.rows = []
+
+
+def _take_provenance(
+    session: Session,
+    items: Sequence[Tuple[str, Dict[str, Any], Optional[str]]],
+    editor: Optional[str] = None,
+    batch: Optional[ProvenanceBatch] = None,
+) -> List[Dict[str, Any]]:
+    """Move each card's ``provenance`` list into ``risk_provenance`` rows.
+
+    ``items`` are ``(risk_id, card, action)``; a non-empty ``action`` is recorded as a new entry.
+    Entries already stored for the risk are skipped. Each card is left with an empty
+    ``provenance`` list and an updated ``provenance_summary``. Returns the rows to insert once
+    the risks themselves have been written (see ``_insert_provenance``). With ``batch`` the
+    stored counts and keys come from it, and are updated, instead of being queried.
+    """
+    recorded_at = datetime.utcnow()
+    pending: List[Tuple[str, Dict[str, Any], List[Dict[str, Any]]]] = []
+    for risk_id, card, action in items:
+        entries = _card_provenance(card)
+        if action:
+            entries.append(_provenance_entry(action, editor))
+        pending.append((risk_id, card, [_provenance_row(risk_id, entry, recorded_at) for entry in entries]))
+    if batch is not None:
+        counts, seen = batch.counts, batch.seen
+    else:
+        risk_ids = {risk_id for risk_id, _card, _rows in pending}
+        counts = {}
+        for start in range(0, len(risk_ids), LINK_SYNC_CHUNK):
+            chunk = sorted(risk_ids)[start : start + LINK_SYNC_CHUNK]
+            stmt = (
+                select(RiskProvenance.risk_id, func.count())
+                .where(RiskProvenance.risk_id.in_(chunk))
+                .group_by(RiskProvenance.risk_id)
+            )
+            counts.update(dict(session.execute(stmt).all()))
+        seen = _stored_provenance_keys(session, [row for _risk_id, _card, rows in pending for row in rows])
+    to_insert: List[Dict[str, Any]] = []
+    for risk_id, card, rows in pending:
+        fresh = _unseen_provenance(rows, seen)
+        counts[risk_id] = counts.get(risk_id, 0) + len(fresh)
+        card["provenance"] = []
+        if fresh:
+            card["provenance_summary"] = _provenance_summary(counts[risk_id], fresh[-1]["entry"], recorded_at)
+        to_insert.extend(fresh)
+    return to_insert
+
+
+def _stored_provenance_keys(session: Session, rows: Sequence[Dict[str, Any]]) -> Set[Tuple[str, str]]:
+    """Return the ``(risk_id, entry_hash)`` keys among ``rows`` that are already stored."""
+    keys = [(row["risk_id"], row["entry_hash"]) for row in rows]
+    seen: Set[Tuple[str, str]] = set()
+    for start in range(0, len(keys), LINK_SYNC_CHUNK):
+        chunk_keys = keys[start : start + LINK_SYNC_CHUNK]
+        stmt = select(RiskProvenance.risk_id, RiskProvenance.entry_hash).where(
+            tuple_(RiskProvenance.risk_id, RiskProvenance.entry_hash).in_(chunk_keys)
+        )
+        seen.update(tuple(row) for row in session.execute(stmt).all())
+    return seen
+
+
+def _unseen_provenance(rows: Sequence[Dict[str, Any]], seen: Set[Tuple[str, str]]) -> List[Dict[str, Any]]:
+    """Drop rows whose key is in ``seen`` (or repeated within ``rows``), adding the kept keys to it."""
+    fresh = []
+    for row in rows:
+        key = (row["risk_id"], row["entry_hash"])
+        if key not in seen:
+            seen.add(key)
+            fresh.append(row)
+    return fresh
+
+
+def _insert_provenance(session: Session, rows: List[Dict[str, Any]]) -> None:
+    if rows:
+        session.execute(insert(RiskProvenance), rows)
+
+
+def _add_provenance(session: Session, rows: List[Dict[str, Any]], batch: Optional[ProvenanceBatch]) -> None:
+    if batch is None:
+        _insert_provenance(session, rows)
+    else:
+        batch.rows.extend(rows)
+
+
+_risk_cache = ReadCache(settings.cache_max_entries, settings.cache_ttl_seconds)
+_query_cache = ReadCache(settings.cache_max_entries, settings.cache_ttl_seconds)
+_CACHE_DIRTY_KEY = "risk_cache_dirty"
+LINK_SYNC_CHUNK = 500
+# Card fields mirrored into the risk_category / risk_context link tables.
+LINKED_CARD_FIELDS = frozenset({"categories", "energy_context"})
+
+
+def invalidate_cache(session: Session, risk_ids: Iterable[str]) -> None:
+    """Drop cached reads for ``risk_ids`` and every cached listing.
+
+    Reads check cached entries against the current ETag, so writes made elsewhere (the ingest
+    CLI, other workers) are never served stale; this frees superseded entries early. The same
+    ids are dropped again once ``session`` commits or rolls back, so nothing read from the open
+    transaction outlives it.
+    """
+    risk_ids = set(risk_ids)
+    session.info.setdefault(_CACHE_DIRTY_KEY, set()).update(risk_ids)
+    _evict(risk_ids)
+
+
+def clear_cache() -> None:
+    _risk_cache.clear()
+    _query_cache.clear()
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    return {"risks": _risk_cache.stats(), "queries": _query_cache.stats()}
+
+
+def _evict(risk_ids: Iterable[str]) -> None:
+    for risk_id in risk_ids:
+        _risk_cache.discard(risk_id)
+    _query_cache.clear()
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _evict_after_transaction(session: Session) -> None:
+    dirty = session.info.pop(_CACHE_DIRTY_KEY, None)
+    if dirty is not None:
+        _evict(dirty)
+
+
+def _dialect_name(session: Session) -> str:
+    return session.get_bind().dialect.name
+
+
+def _card_array_contains(session: Session, key: str, value: str) -> ColumnElement[bool]:
+    if _dialect_name(session) == "postgresql":
+        return Risk.card.contains({key: [value]})
+    items = func.json_each(Risk.card, f"$.{key}").table_valued("value").alias(f"{key}_items")
+    return exists(select(1).select_from(items).where(func.lower(items.c.value) == value))
+
+
+def _card_field_equals(session: Session, key: str, value: str) -> ColumnElement[bool]:
+    if _dialect_name(session) == "postgresql":
+        return Risk.card.contains({key: value})
+    return Risk.card[key].as_string() == value
+
+
+@dataclass(frozen=True)
+class RiskFilters:
+    q: Optional[str] = None
+    min_impact: Optional[int] = None
+    ids: Optional[Tuple[str, ...]] = None
+    category: Optional[str] = None
+    lifecycle_stage: Optional[str] = None
+    altai: Optional[str] = None
+    context: Optional[str] = None
+    min_exposure: Optional[int] = None
+    min_criticality: Optional[int] = None
+
+
+def _build_risk_query(session: Session, filters: RiskFilters) -> Tuple[Select, Optional[ColumnElement[float]]]:
+    stmt = select(Risk)
+    rank = None
+    if filters.ids:
+        stmt = stmt.where(Risk.risk_id.in_(filters.ids))
+    if filters.q:
+        stmt, rank = search_service.apply_search(session, stmt, filters.q)
+    if filters.min_impact is not None:
+        stmt = stmt.where(Risk.card["impact_level"].as_integer() >= filters.min_impact)
+    if filters.category:
+        stmt = stmt.where(_card_array_contains(session, "categories", filters.category.lower()))
+    if filters.lifecycle_stage:
+        stmt = stmt.where(_card_field_equals(session, "lifecycle_stage", filters.lifecycle_stage))
+    if filters.altai:
+        stmt = stmt.where(_card_array_contains(session, "altai_requirements", filters.altai.lower()))
+    if filters.context or filters.min_exposure is not None or filters.min_criticality is not None:
+        stmt = stmt.where(
+            _context_link_exists(
+                context=filters.context,
+                min_exposure=filters.min_exposure,
+                min_criticality=filters.min_criticality,
+            )
+        )
+    return stmt, rank
+
+
+def _context_link_exists(
+    *,
+    context: Optional[str] = None,
+    min_exposure: Optional[int] = None,
+    min_criticality: Optional[int] = None,
+) -> ColumnElement[bool]:
+    link = select(RiskContext.risk_id).where(RiskContext.risk_id == Risk.risk_id)
+    if context:
+        link = link.where(RiskContext.context_id == context)
+    if min_exposure is not None:
+        link = link.where(RiskContext.exposure_level >= min_exposure)
+    if min_criticality is not None:
+        link = link.join(EnergyContext, EnergyContext.context_id == RiskContext.context_id).where(
+            EnergyContext.criticality_level >= min_criticality
+        )
+    return exists(link)
+
+
+def encode_cursor(keys: Sequence[Any]) -> str:
+    raw = json.dumps(list(keys), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+CURSOR_NUMBER = (int, float)
+
+
+def decode_cursor(cursor: str, *types: Union[type, Tuple[type, ...]]) -> List[Any]:
+    """Decode ``cursor`` into one key per entry of ``types``, each an instance of that type.
+
+    Keys are type-checked here so a forged cursor is a ``ValueError`` rather than a comparison
+    the database rejects.
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        keys = json.loads(base64.b64decode(padded.encode(), altchars=b"-_", validate=True))
+    except (binascii.Error, ValueError) as exc:
+        raise ValueError(f"Invalid cursor '{cursor}'") from exc
+    if not isinstance(keys, list) or len(keys) != len(types):
+        raise ValueError(f"Invalid cursor '{cursor}'")
+    for key, expected in zip(keys, types):
+        if isinstance(key, bool) or not isinstance(key, expected):
+            raise ValueError(f"Invalid cursor '{cursor}'")
+        if isinstance(key, float) and not math.isfinite(key):
+            raise ValueError(f"Invalid cursor '{cursor}'")
+    return keys
+
+
+def _projection_columns(fields: Sequence[str]) -> List[Any]:
+    unknown = sorted(set(fields) - PROJECTABLE_CARD_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown card fields: {', '.join(unknown)}")
+    return [Risk.risk_id, Risk.status, Risk.version, *(Risk.card[field].label(field) for field in fields)]
+
+
+def _projection_payload(row: Row, fields: Sequence[str]) -> Dict[str, Any]:
+    return {
+        "risk_id": row.risk_id,
+        "status": row.status,
+        "version": row.version,
+        "card": lowercase_card_lists({field: row._mapping[field] for field in fields}),
+    }
+
+
+def get_risk_page(
+    session: Session,
+    filters: RiskFilters,
+    *,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+    trusted: bool = False,
+    etag: Optional[str] = None,
+) -> Tuple[List[Any], Optional[str]]:
+    """Return one keyset page of risks and the cursor for the next page.
+
+    Items are ``RiskResponse`` (or ``RiskProjection`` when ``fields`` is set). With ``trusted``
+    they are plain dicts built straight from the rows, skipping model validation of cards that
+    were already validated on write. Pages are cached under the collection ETag (``etag`` when
+    the caller already computed it) and must be treated as read-only.
+    """
+    if etag is None:
+        etag = get_collection_etag(session, filters, limit, cursor, fields)
+    cache_key = (etag, filters, limit, cursor, tuple(fields) if fields else None, trusted)
+    cached = _query_cache.get(cache_key)
+    if cached is not MISSING:
+        return cached
+    page = _load_risk_page(session, filters, limit=limit, cursor=cursor, fields=fields, trusted=trusted)
+    _query_cache.set(cache_key, page)
+    return page
+
+
+def _load_risk_page(
+    session: Session,
+    filters: RiskFilters,
+    *,
+    limit: int,
+    cursor: Optional[str],
+    fields: Optional[Sequence[str]],
+    trusted: bool,
+) -> Tuple[List[Any], Optional[str]]:
+    stmt, rank = _build_risk_query(session, filters)
+    if fields:
+        stmt = stmt.with_only_columns(*_projection_columns(fields), maintain_column_froms=True)
+    if rank is None:
+        if cursor:
+            (after_id,) = decode_cursor(cursor, str)
+            stmt = stmt.where(Risk.risk_id > after_id)
+        stmt = stmt.order_by(Risk.risk_id)
+    else:
+        stmt = stmt.add_columns(rank.label("search_rank"))
+        if cursor:
+            after_rank, after_id = decode_cursor(cursor, CURSOR_NUMBER, str)
+            stmt = stmt.where(or_(rank < after_rank, and_(rank == after_rank, Risk.risk_id > after_id)))
+        stmt = stmt.order_by(rank.desc(), Risk.risk_id)
+    rows = session.execute(stmt.limit(limit + 1)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        last_id = last.risk_id if fields else last[0].risk_id
+        next_cursor = encode_cursor([last_id] if rank is None else [last.search_rank, last_id])
+    if fields:
+        payloads = [_projection_payload(row, fields) for row in rows]
+        if trusted:
+            return payloads, next_cursor
+        return [RiskProjection(**payload) for payload in payloads], next_cursor
+    if trusted:
+        return [_to_payload(row[0]) for row in rows], next_cursor
+    return [_to_response(row[0]) for row in rows], next_cursor
 
 
 def get_risks(
@@ -42,66 +444,192 @@ def get_risks(
     category: Optional[str] = None,
     lifecycle_stage: Optional[str] = None,
     altai: Optional[str] = None,
+    context: Optional[str] = None,
+    min_exposure: Optional[int] = None,
+    min_criticality: Optional[int] = None,
 ) -> List[RiskResponse]:
-    stmt = select(Risk)
-    if ids:
-        stmt = stmt.where(Risk.risk_id.in_(ids))
-    if q:
-        stmt = stmt.where(func.lower(cast(Risk.card, Text)).like(f"%{q.lower()}%"))
-    if min_impact is not None:
-        stmt = stmt.where(Risk.card["impact_level"].as_integer() >= min_impact)
-    risks = session.execute(stmt).scalars().all()
-    if category:
-        category_lower = category.lower()
-        risks = [
-            risk
-            for risk in risks
-            if category_lower in {item.lower() for item in risk.card.get("categories", [])}
-        ]
-    if lifecycle_stage:
-        risks = [
-            risk
-            for risk in risks
-            if risk.card.get("lifecycle_stage") == lifecycle_stage
-        ]
-    if altai:
-        altai_lower = altai.lower()
-        risks = [
-            risk
-            for risk in risks
-            if altai_lower in {item.lower() for item in risk.card.get("altai_requirements", [])}
-        ]
-    if limit:
-        risks = risks[:limit]
-    return [_to_response(risk) for risk in risks]
-
-
-def get_risk(session: Session, risk_id: str) -> RiskResponse:
+    filters = RiskFilters(
+        q=q,
+        min_impact=min_impact,
+        ids=tuple(ids) if ids else None,
+        category=category,
+        lifecycle_stage=lifecycle_stage,
+        altai=altai,
+        context=context,
+        min_exposure=min_exposure,
+        min_criticality=min_criticality,
+    )
+    risks, _next_cursor = get_risk_page(session, filters, limit=limit)
+    return risks
+
+
+def iter_risk_payloads(
+    session: Session, risk_ids: Sequence[str], chunk_size: int
+) -> Iterator[Tuple[List[Dict[str, Any]], List[str]]]:
+    """Yield ``(payloads, missing_ids)`` per chunk of ``risk_ids``, preserving request order."""
+    columns = (Risk.risk_id, Risk.status, Risk.version, Risk.card, Risk.created_at, Risk.updated_at, Risk.revision)
+    for start in range(0, len(risk_ids), chunk_size):
+        chunk = risk_ids[start : start + chunk_size]
+        rows = session.execute(select(*columns).where(Risk.risk_id.in_(chunk))).all()
+        found = {row.risk_id: row for row in rows}
+        payloads = [_to_payload(found[risk_id]) for risk_id in chunk if risk_id in found]
+        missing = [risk_id for risk_id in chunk if risk_id not in found]
+        yield payloads, missing
+
+
+def get_collection_etag(session: Session, filters: RiskFilters, *variant: Any) -> str:
+    """Fingerprint a filtered collection by its row count, revision total and latest ``updated_at``.
+
+    The revision total moves on every write, even when ``updated_at`` does not (one-second
+    resolution on SQLite, transaction start time on Postgres). ``variant`` carries request
+    parameters that change the representation (page size, cursor, projected fields) so each
+    distinct page gets its own tag.
+    """
+    stmt, _rank = _build_risk_query(session, filters)
+    stmt = stmt.with_only_columns(
+        func.count(Risk.risk_id), func.sum(Risk.revision), func.max(Risk.updated_at), maintain_column_froms=True
+    )
+    count, revisions, last_updated = session.execute(stmt).one()
+    return compute_etag(repr(filters), *variant, count, revisions, last_updated)
+
+
+def get_risk_etag(session: Session, risk_id: str) -> str:
+    row = session.execute(
+        select(Risk.risk_id, Risk.revision, Risk.created_at).where(Risk.risk_id == risk_id)
+    ).first()
+    if row is None:
+        raise NoResultFound(f"Risk {risk_id} not found")
+    return risk_etag(row)
+
+
+def risk_etag(risk: Union[Risk, Row, RiskResponse]) -> str:
+    """Strong ETag for one risk, derived from its row revision.
+
+    ``created_at`` is included so a deleted and re-created risk does not reuse old tags.
+    """
+    return compute_etag(risk.risk_id, risk.revision, risk.created_at)
+
+
+def compute_etag(*parts: Any) -> str:
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def _check_if_match(risk: Union[Risk, Row], if_match: Optional[str]) -> None:
+    """Raise ``StaleDataError`` unless ``if_match`` names the current revision (strong comparison)."""
+    if if_match is None:
+        return
+    candidates = {tag.strip() for tag in if_match.split(",")}
+    if "*" not in candidates and risk_etag(risk) not in candidates:
+        raise StaleDataError(f"Risk {risk.risk_id} has been modified (revision {risk.revision})")
+
+
+def get_risk(session: Session, risk_id: str, etag: Optional[str] = None) -> RiskResponse:
+    """Return one risk, from the read cache only while its ETag still matches the stored row.
+
+    ``etag`` is the current tag when the caller already looked it up with ``get_risk_etag``.
+    """
+    if etag is None:
+        etag = get_risk_etag(session, risk_id)
+    cached = _risk_cache.get(risk_id)
+    if cached is not MISSING and cached[0] == etag:
+        return cached[1]
     risk = session.get(Risk, risk_id)
     if not risk:
         raise NoResultFound(f"Risk {risk_id} not found")
-    return _to_response(risk)
+    response = _to_response(risk)
+    _risk_cache.set(risk_id, (risk_etag(response), response))
+    return response
+
+
+# Async read paths: the query and cache logic above runs unchanged on the AsyncSession's
+# greenlet-backed sync session, while the event loop awaits the driver I/O.
+
+
+async def get_risk_async(session: AsyncSession, risk_id: str, etag: Optional[str] = None) -> RiskResponse:
+    return await session.run_sync(get_risk, risk_id, etag)
 
 
-def create_risk(session: Session, payload: RiskCreate, editor: Optional[str] = None) -> RiskResponse:
+async def get_risk_etag_async(session: AsyncSession, risk_id: str) -> str:
+    return await session.run_sync(get_risk_etag, risk_id)
+
+
+async def get_risk_page_async(
+    session: AsyncSession,
+    filters: RiskFilters,
+    *,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+    trusted: bool = False,
+    etag: Optional[str] = None,
+) -> Tuple[List[Any], Optional[str]]:
+    return await session.run_sync(
+        get_risk_page, filters, limit=limit, cursor=cursor, fields=fields, trusted=trusted, etag=etag
+    )
+
+
+async def get_collection_etag_async(session: AsyncSession, filters: RiskFilters, *variant: Any) -> str:
+    return await session.run_sync(get_collection_etag, filters, *variant)
+
+
+async def get_brief_async(session: AsyncSession, ids: Optional[Sequence[str]] = None) -> List[RiskBrief]:
+    return await session.run_sync(get_brief, ids)
+
+
+def create_risk(
+    session: Session,
+    payload: RiskCreate,
+    editor: Optional[str] = None,
+    card_fingerprint: Optional[str] = None,
+    sync_links: bool = True,
+    provenance: Optional[ProvenanceBatch] = None,
+) -> RiskResponse:
+    """Insert a risk.
+
+    ``sync_links=False`` and ``provenance`` are for callers that sync links and insert provenance
+    rows for a whole batch (see ``load_provenance_batch``).
+    """
     card_dict = payload.card.dict()
     card_dict = _ensure_stable_id(card_dict, payload.risk_id)
-    _append_provenance(card_dict, "create", editor)
+    provenance_rows = _take_provenance(session, [(payload.risk_id, card_dict, "create")], editor, provenance)
     risk = Risk(
         risk_id=payload.risk_id,
         status=payload.status,
         version=payload.version or payload.card.version,
         card=card_dict,
+        card_fingerprint=card_fingerprint,
     )
     session.add(risk)
     session.flush()
+    _add_provenance(session, provenance_rows, provenance)
+    if sync_links:
+        sync_card_links(session, {payload.risk_id: card_dict})
+    invalidate_cache(session, [payload.risk_id])
     return _to_response(risk)
 
 
-def update_risk(session: Session, risk_id: str, payload: RiskUpdate, editor: Optional[str] = None) -> RiskResponse:
+def update_risk(
+    session: Session,
+    risk_id: str,
+    payload: RiskUpdate,
+    editor: Optional[str] = None,
+    if_match: Optional[str] = None,
+    card_fingerprint: Optional[str] = None,
+    sync_links: bool = True,
+    provenance: Optional[ProvenanceBatch] = None,
+) -> RiskResponse:
+    """Replace a risk; the UPDATE only applies if the row still has the revision that was read.
+
+    Raises ``StaleDataError`` if ``if_match`` is stale or a concurrent writer got there first.
+    ``card_fingerprint`` is only passed by the CSV ingest; other writes clear the stored one.
+    The category and context links follow a replaced card unless ``sync_links`` is off, and
+    provenance rows are left in ``provenance`` for the caller to insert when it is given.
+    """
     risk = session.get(Risk, risk_id)
     if not risk:
         raise NoResultFound(f"Risk {risk_id} not found")
+    _check_if_match(risk, if_match)
     if payload.status is not None:
         risk.status = payload.status
     if payload.version is not None:
@@ -109,61 +637,367 @@ def update_risk(session: Session, risk_id: str, payload: RiskUpdate, editor: Opt
     if payload.card is not None:
         card_dict = payload.card.dict()
         card_dict = _ensure_stable_id(card_dict, risk_id)
-        _append_provenance(card_dict, "replace", editor)
-        risk.card = card_dict
     else:
         card_dict = dict(risk.card)
-        _append_provenance(card_dict, "replace", editor)
-        risk.card = card_dict
+    provenance_rows = _take_provenance(session, [(risk_id, card_dict, "replace")], editor, provenance)
+    risk.card = card_dict
+    risk.card_fingerprint = card_fingerprint
     session.flush()
+    _add_provenance(session, provenance_rows, provenance)
+    if sync_links and payload.card is not None:
+        sync_card_links(session, {risk_id: card_dict})
+    invalidate_cache(session, [risk_id])
     return _to_response(risk)
 
 
-def patch_risk(session: Session, risk_id: str, payload: RiskPatch, editor: Optional[str] = None) -> RiskResponse:
-    risk = session.get(Risk, risk_id)
-    if not risk:
-        raise NoResultFound(f"Risk {risk_id} not found")
+def patch_risk(
+    session: Session,
+    risk_id: str,
+    payload: RiskPatch,
+    editor: Optional[str] = None,
+    if_match: Optional[str] = None,
+) -> RiskResponse:
+    """Apply ``payload`` with a single ``UPDATE ... RETURNING``; the stored card is never read first.
+
+    ``card_updates`` is an RFC 7396 merge patch: nested objects are merged, ``null`` removes a key
+    and any other value replaces it. The patched card is validated from the returned row, so an
+    invalid result raises ``ValidationError`` and must be rolled back by the caller. Raises
+    ``StaleDataError`` if ``if_match`` does not match the current revision.
+    """
+    table = Risk.__table__
+    stmt = update(table).where(table.c.risk_id == risk_id)
+    if if_match is not None:
+        current = session.execute(
+            select(table.c.risk_id, table.c.revision, table.c.created_at).where(table.c.risk_id == risk_id)
+        ).first()
+        if current is None:
+            raise NoResultFound(f"Risk {risk_id} not found")
+        _check_if_match(current, if_match)
+        stmt = stmt.where(table.c.revision == current.revision)
+    card_patch = lowercase_card_lists({**(payload.card_updates or {}), "stable_id": risk_id})
+    # Provenance is append-only: entries in the patch are recorded as rows, never merged into the card.
+    entries = _card_provenance(card_patch) if "provenance" in card_patch else []
+    if "provenance" in card_patch:
+        card_patch["provenance"] = []
+    entries.append(_provenance_entry("patch", editor))
+    recorded_at = datetime.utcnow()
+    provenance_rows = [_provenance_row(risk_id, entry, recorded_at) for entry in entries]
+    # Entries carried by the patch may already be stored; the timestamped "patch" entry is always new,
+    # so the lookup is only needed when the patch brought its own.
+    seen = _stored_provenance_keys(session, provenance_rows[:-1]) if len(provenance_rows) > 1 else set()
+    provenance_rows = _unseen_provenance(provenance_rows, seen)
+    summary = _provenance_summary(len(provenance_rows), provenance_rows[-1]["entry"], recorded_at)
+    values: Dict[str, Any] = {
+        "card": _patched_card(_dialect_name(session), table.c.card, card_patch, summary),
+        "updated_at": func.now(),
+        "revision": table.c.revision + 1,
+        "card_fingerprint": None,
+    }
     if payload.status is not None:
-        risk.status = payload.status
+        values["status"] = payload.status
     if payload.version is not None:
-        risk.version = payload.version
-    card_dict = dict(risk.card)
-    updates = payload.card_updates or {}
-    for key, value in updates.items():
-        card_dict[key] = value
-    card_dict = _ensure_stable_id(card_dict, risk_id)
-    _append_provenance(card_dict, "patch", editor)
-    risk.card = card_dict
-    session.flush()
-    return _to_response(risk)
+        values["version"] = payload.version
+    columns = (Risk.risk_id, Risk.status, Risk.version, Risk.card, Risk.created_at, Risk.updated_at, Risk.revision)
+    row = session.execute(stmt.values(**values).returning(*columns)).first()
+    if row is None:
+        if if_match is not None:
+            raise StaleDataError(f"Risk {risk_id} was modified concurrently")
+        raise NoResultFound(f"Risk {risk_id} not found")
+    # Keep an already-loaded instance from shadowing the new row (and tripping its version check).
+    loaded = session.identity_map.get(session.identity_key(Risk, risk_id))
+    if loaded is not None:
+        session.expire(loaded)
+    _insert_provenance(session, provenance_rows)
+    if LINKED_CARD_FIELDS & card_patch.keys():
+        sync_card_links(session, {risk_id: row.card})
+    invalidate_cache(session, [risk_id])
+    return RiskResponse(**_to_payload(row))
+
+
+def _patched_card(dialect: str, card: Any, patch: Dict[str, Any], summary: Dict[str, Any]) -> ColumnElement:
+    """SQL expression for ``card`` with ``patch`` merged in and ``provenance_summary`` advanced.
+
+    ``summary["count"]`` is the number of entries being added; it is added to the stored count.
+    """
+    added = summary["count"]
+    if dialect == "postgresql":
+        stored = cast(card["provenance_summary"]["count"].astext, Integer)
+        summary_expr = literal(summary, JSONB).op("||", return_type=JSONB)(
+            func.jsonb_build_object(cast("count", Text), func.coalesce(stored, 0) + added)
+        )
+        return _jsonb_merge_patch(card, {**patch, "provenance_summary": summary_expr})
+    # SQLite's JSON1 json_patch() implements RFC 7396 directly.
+    stored = func.json_extract(card, "$.provenance_summary.count")
+    # The count is set inside the new summary: json_set() does not apply a later path that points
+    # into a value inserted earlier in the same call, which silently reset the count.
+    summary_expr = func.json_set(func.json(json.dumps(summary)), "$.count", func.coalesce(stored, 0) + added)
+    return func.json_set(func.json_patch(card, json.dumps(patch)), "$.provenance_summary", summary_expr)
+
+
+def _jsonb_merge_patch(target: Any, patch: Dict[str, Any]) -> ColumnElement:
+    """Build an RFC 7396 merge of ``patch`` into the JSONB expression ``target``.
+
+    Values may also be SQL expressions, which replace the key like any other non-object value.
+    """
+    removed = sorted(key for key, value in patch.items() if value is None)
+    nested = sorted(key for key, value in patch.items() if isinstance(value, dict))
+    replaced = {key: value for key, value in patch.items() if value is not None and not isinstance(value, dict)}
+    expr = target
+    for key in removed:
+        expr = expr.op("-", return_type=JSONB)(cast(key, Text))
+    for key in nested:
+        base = case((func.jsonb_typeof(target[key]) == "object", target[key]), else_=literal({}, JSONB))
+        path = cast(postgresql_array([key]), ARRAY(Text))
+        expr = func.jsonb_set(expr, path, _jsonb_merge_patch(base, patch[key]), type_=JSONB)
+    plain = {key: value for key, value in replaced.items() if not isinstance(value, ColumnElement)}
+    if plain:
+        expr = expr.op("||", return_type=JSONB)(literal(plain, JSONB))
+    for key, value in sorted((key, value) for key, value in replaced.items() if isinstance(value, ColumnElement)):
+        expr = func.jsonb_set(expr, cast(postgresql_array([key]), ARRAY(Text)), value, type_=JSONB)
+    return expr
+
+
+def bulk_upsert_risks(
+    session: Session,
+    payloads: Sequence[RiskCreate],
+    editor: Optional[str] = None,
+    chunk_size: int = 500,
+) -> Dict[str, str]:
+    """Create or replace ``payloads`` with one ``INSERT ... ON CONFLICT DO UPDATE`` per chunk.
+
+    Returns ``{risk_id: "created" | "updated"}``. Risk ids must be unique within ``payloads``.
+    """
+    insert = postgresql_insert if _dialect_name(session) == "postgresql" else sqlite_insert
+    outcome: Dict[str, str] = {}
+    for start in range(0, len(payloads), chunk_size):
+        chunk = payloads[start : start + chunk_size]
+        chunk_ids = [payload.risk_id for payload in chunk]
+        existing = set(session.execute(select(Risk.risk_id).where(Risk.risk_id.in_(chunk_ids))).scalars())
+        rows = []
+        provenance_items = []
+        for payload in chunk:
+            action = "replace" if payload.risk_id in existing else "create"
+            card_dict = _ensure_stable_id(payload.card.dict(), payload.risk_id)
+            provenance_items.append((payload.risk_id, card_dict, action))
+            rows.append(
+                {
+                    "risk_id": payload.risk_id,
+                    "status": payload.status,
+                    "version": payload.version or payload.card.version,
+                    "card": card_dict,
+                }
+            )
+            outcome[payload.risk_id] = "updated" if action == "replace" else "created"
+        stmt = insert(Risk.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Risk.risk_id],
+            set_={
+                "status": stmt.excluded.status,
+                "version": stmt.excluded.version,
+                "card": stmt.excluded.card,
+                "updated_at": func.now(),
+                "revision": Risk.__table__.c.revision + 1,
+                "card_fingerprint": None,
+            },
+        )
+        provenance_rows = _take_provenance(session, provenance_items, editor)
+        session.execute(stmt, rows)
+        _insert_provenance(session, provenance_rows)
+        sync_card_links(session, {row["risk_id"]: row["card"] for row in rows})
+        invalidate_cache(session, chunk_ids)
+    return outcome
 
 
 def delete_risk(session: Session, risk_id: str) -> None:
+    """Delete a risk; like ``update_risk`` the DELETE only applies to the revision that was read.
+
+    Raises ``StaleDataError`` if a concurrent writer changed the risk first.
+    """
     risk = session.get(Risk, risk_id)
     if not risk:
         raise NoResultFound(f"Risk {risk_id} not found")
     session.delete(risk)
+    # ON DELETE CASCADE covers PostgreSQL; SQLite does not enforce foreign keys by default.
+    session.execute(delete(RiskProvenance).where(RiskProvenance.risk_id == risk_id))
     session.flush()
+    invalidate_cache(session, [risk_id])
 
 
-def set_categories(session: Session, risk_id: str, category_ids: Iterable[str]) -> None:
-    session.query(RiskCategory).filter(RiskCategory.risk_id == risk_id).delete()
-    for category_id in category_ids:
-        session.merge(
-            RiskCategory(risk_id=risk_id, category_id=category_id, assignment_type="canonical")
+def get_provenance_page(
+    session: Session, risk_id: str, *, limit: int = 50, cursor: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Return one page of a risk's provenance history, oldest first, and the next cursor."""
+    if session.execute(select(Risk.risk_id).where(Risk.risk_id == risk_id)).first() is None:
+        raise NoResultFound(f"Risk {risk_id} not found")
+    stmt = (
+        select(RiskProvenance)
+        .where(RiskProvenance.risk_id == risk_id)
+        .order_by(RiskProvenance.recorded_at, RiskProvenance.provenance_id)
+        .limit(limit + 1)
+    )
+    if cursor:
+        recorded_at, provenance_id = decode_cursor(cursor, str, int)
+        try:
+            after = (datetime.fromisoformat(recorded_at), int(provenance_id))
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"Invalid cursor '{cursor}'") from exc
+        stmt = stmt.where(tuple_(RiskProvenance.recorded_at, RiskProvenance.provenance_id) > after)
+    records = session.execute(stmt).scalars().all()
+    next_cursor = None
+    if len(records) > limit:
+        records = records[:limit]
+        last = records[-1]
+        next_cursor = encode_cursor([last.recorded_at.isoformat(), last.provenance_id])
+    items = [
+        {"recorded_at": record.recorded_at, "action": record.action, "editor": record.editor, "entry": record.entry}
+        for record in records
+    ]
+    return items, next_cursor
+
+
+def migrate_card_provenance(session: Session, chunk_size: int = 500) -> int:
+    """Move provenance lists still embedded in cards into ``risk_provenance``; returns risks migrated."""
+    migrated = 0
+    last_id = ""
+    while True:
+        rows = session.execute(
+            select(Risk.risk_id, Risk.card).where(Risk.risk_id > last_id).order_by(Risk.risk_id).limit(chunk_size)
+        ).all()
+        if not rows:
+            return migrated
+        last_id = rows[-1].risk_id
+        items = [(row.risk_id, dict(row.card), None) for row in rows if row.card.get("provenance")]
+        if not items:
+            continue
+        provenance_rows = _take_provenance(session, items)
+        table = Risk.__table__
+        stmt = (
+            update(table)
+            .where(table.c.risk_id == bindparam("target_id"))
+            .values(card=bindparam("new_card"), revision=table.c.revision + 1)
         )
+        session.execute(stmt, [{"target_id": risk_id, "new_card": card} for risk_id, card, _action in items])
+        _insert_provenance(session, provenance_rows)
+        invalidate_cache(session, [risk_id for risk_id, _card, _action in items])
+        migrated += len(items)
+
+
+def set_categories(session: Session, risk_id: str, category_ids: Iterable[str]) -> None:
+    sync_categories(session, {risk_id: category_ids})
 
 
 def set_contexts(session: Session, risk_id: str, context_refs: Iterable[Dict[str, Any]]) -> None:
-    session.query(RiskContext).filter(RiskContext.risk_id == risk_id).delete()
-    for context_ref in context_refs:
-        session.merge(
-            RiskContext(
-                risk_id=risk_id,
-                context_id=context_ref["context_id"],
-                exposure_level=context_ref.get("exposure_level", 3),
-            )
+    sync_contexts(session, {risk_id: context_refs})
+
+
+def sync_categories(session: Session, desired: Dict[str, Iterable[str]]) -> None:
+    """Make ``risk_category`` match ``desired`` ({risk_id: category_ids}) with bulk statements.
+
+    Only links that differ from what is stored are inserted or deleted.
+    """
+    current = {
+        (row.risk_id, row.category_id)
+        for row in _select_links(session, RiskCategory, desired.keys(), RiskCategory.risk_id, RiskCategory.category_id)
+    }
+    wanted = {(risk_id, category_id) for risk_id, category_ids in desired.items() for category_id in category_ids}
+    to_insert = [
+        {"risk_id": risk_id, "category_id": category_id, "assignment_type": "canonical"}
+        for risk_id, category_id in sorted(wanted - current)
+    ]
+    to_delete = sorted(current - wanted)
+    if to_delete:
+        session.execute(
+            delete(RiskCategory).where(tuple_(RiskCategory.risk_id, RiskCategory.category_id).in_(to_delete))
+        )
+    if to_insert:
+        session.execute(insert(RiskCategory), to_insert)
+    changed = {risk_id for risk_id, _category_id in to_delete} | {row["risk_id"] for row in to_insert}
+    if changed:
+        invalidate_cache(session, changed)
+
+
+def sync_contexts(session: Session, desired: Dict[str, Iterable[Dict[str, Any]]]) -> None:
+    """Make ``risk_context`` match ``desired`` ({risk_id: context_refs}) with bulk statements.
+
+    Only links that are new, removed, or have a changed exposure level are written. A ref without
+    ``exposure_level`` keeps the stored level (3 for a new link).
+    """
+    current = {
+        (row.risk_id, row.context_id): row.exposure_level
+        for row in _select_links(
+            session, RiskContext, desired.keys(), RiskContext.risk_id, RiskContext.context_id, RiskContext.exposure_level
         )
+    }
+    wanted = {
+        (risk_id, ref["context_id"]): ref.get("exposure_level", current.get((risk_id, ref["context_id"]), 3))
+        for risk_id, refs in desired.items()
+        for ref in refs
+    }
+    to_insert = [
+        {"risk_id": risk_id, "context_id": context_id, "exposure_level": wanted[(risk_id, context_id)]}
+        for risk_id, context_id in sorted(wanted.keys() - current.keys())
+    ]
+    to_update = [
+        {"risk_id": risk_id, "context_id": context_id, "exposure_level": level}
+        for (risk_id, context_id), level in sorted(wanted.items())
+        if (risk_id, context_id) in current and current[(risk_id, context_id)] != level
+    ]
+    to_delete = sorted(current.keys() - wanted.keys())
+    if to_delete:
+        session.execute(delete(RiskContext).where(tuple_(RiskContext.risk_id, RiskContext.context_id).in_(to_delete)))
+    if to_insert:
+        session.execute(insert(RiskContext), to_insert)
+    if to_update:
+        session.execute(update(RiskContext), to_update)
+    changed = {risk_id for risk_id, _context_id in to_delete} | {row["risk_id"] for row in to_insert + to_update}
+    if changed:
+        invalidate_cache(session, changed)
+
+
+def sync_card_links(session: Session, cards: Dict[str, Dict[str, Any]]) -> None:
+    """Make the category and context links of each risk match its card ({risk_id: card}).
+
+    Ids missing from the reference tables are skipped, since the links reference them.
+    """
+    category_ids = {category_id for card in cards.values() for category_id in card.get("categories") or []}
+    context_ids = {context_id for card in cards.values() for context_id in card.get("energy_context") or []}
+    known_categories = set(_select_ids(session, Category.category_id, category_ids))
+    known_contexts = set(_select_ids(session, EnergyContext.context_id, context_ids))
+    sync_categories(
+        session,
+        {
+            risk_id: [category_id for category_id in card.get("categories") or [] if category_id in known_categories]
+            for risk_id, card in cards.items()
+        },
+    )
+    sync_contexts(
+        session,
+        {
+            risk_id: [
+                {"context_id": context_id}
+                for context_id in card.get("energy_context") or []
+                if context_id in known_contexts
+            ]
+            for risk_id, card in cards.items()
+        },
+    )
+
+
+def _select_ids(session: Session, column: Any, values: Iterable[str]) -> List[str]:
+    values = sorted(values)
+    ids: List[str] = []
+    for start in range(0, len(values), LINK_SYNC_CHUNK):
+        ids.extend(session.execute(select(column).where(column.in_(values[start : start + LINK_SYNC_CHUNK]))).scalars())
+    return ids
+
+
+def _select_links(session: Session, model: Any, risk_ids: Iterable[str], *columns: Any) -> List[Row]:
+    risk_ids = list(risk_ids)
+    rows: List[Row] = []
+    for start in range(0, len(risk_ids), LINK_SYNC_CHUNK):
+        chunk = risk_ids[start : start + LINK_SYNC_CHUNK]
+        rows.extend(session.execute(select(*columns).where(model.risk_id.in_(chunk))).all())
+    return rows
 
 
 def compute_risk_hash(title: str, description: str) -> str:
@@ -183,9 +1017,25 @@ def _to_response(risk: Risk) -> RiskResponse:
         card=RiskCard(**card),
         created_at=risk.created_at,
         updated_at=risk.updated_at,
+        revision=risk.revision,
     )
 
 
+def _to_payload(risk: Union[Risk, Row]) -> Dict[str, Any]:
+    """Plain response dict for output that skips ``RiskResponse`` validation; lists are lowercased as it would."""
+    card = lowercase_card_lists(dict(risk.card))
+    card.setdefault("stable_id", risk.risk_id)
+    return {
+        "risk_id": risk.risk_id,
+        "status": risk.status,
+        "version": risk.version,
+        "card": card,
+        "created_at": risk.created_at,
+        "updated_at": risk.updated_at,
+        "revision": risk.revision,
+    }
+
+
 def get_brief(session: Session, ids: Optional[Sequence[str]] = None) -> List[RiskBrief]:
     stmt = select(
         Risk.risk_id,
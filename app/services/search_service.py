@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import ColumnElement, Select, cast, func, literal, literal_column
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.orm import Session
+
+from app.db.models import Risk, risk_search_table, risk_search_vector
+
+TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def search_terms(q: str) -> List[str]:
+    return TERM_PATTERN.findall(q.lower())
+
+
+def apply_search(session: Session, stmt: Select, q: str) -> Tuple[Select, Optional[ColumnElement[float]]]:
+    """Restrict ``stmt`` to cards matching every term of ``q`` as a prefix.
+
+    Returns the filtered statement and a rank expression where higher is a better match,
+    or ``None`` when ``q`` contains no searchable terms.
+    """
+    terms = search_terms(q)
+    if not terms:
+        return stmt, None
+    if session.get_bind().dialect.name == "postgresql":
+        ts_query = func.to_tsquery(cast(literal("simple"), REGCONFIG), " & ".join(f"{term}:*" for term in terms))
+        stmt = stmt.where(risk_search_vector.op("@@")(ts_query))
+        return stmt, func.ts_rank(risk_search_vector, ts_query)
+    match_expr = " ".join(f'"{term}"*' for term in terms)
+    fts = literal_column(risk_search_table.name)
+    stmt = stmt.join(risk_search_table, risk_search_table.c.risk_id == Risk.risk_id).where(fts.match(match_expr))
+    # bm25() is lower-is-better; negate so both dialects sort descending.
+    return stmt, -func.bm25(fts)
@@ -4,11 +4,13 @@ from typing import Generator
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import text
 
 from app.core import config
 from app.db import session as session_module
 from app.db.init_db import init_db
 from app.main import create_app
+from app.services import risk_service
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -35,6 +37,9 @@ def client() -> Generator[TestClient, None, None]:
 def cleanup_db() -> Generator[None, None, None]:
     yield
     with session_module.get_session() as session:
-        session.execute("DELETE FROM risk_context")
-        session.execute("DELETE FROM risk_category")
-        session.execute("DELETE FROM risk")
+        session.execute(text("DELETE FROM idempotency_record"))
+        session.execute(text("DELETE FROM risk_provenance"))
+        session.execute(text("DELETE FROM risk_context"))
+        session.execute(text("DELETE FROM risk_category"))
+        session.execute(text("DELETE FROM risk"))
+    risk_service.clear_cache()
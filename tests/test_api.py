@@ -1,15 +1,40 @@
 from __future__ import annotations
 
+import csv
+import os
+import re
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import pytest
 import json
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlalchemy.orm.exc import StaleDataError
 from typer.testing import CliRunner
 
 from app.cli import cli as cli_app
-from app.db.models import Risk
+from app.core import vocab
+from app.core.vocab import VocabularyRegistry
+from app.db import init_db
+from app.db.models import Category, IdempotencyRecord, Risk, RiskCategory, RiskContext, RiskProvenance
 from app.db.session import get_session
+from app.main import create_app
+from app.schemas.risk import RiskResponse, RiskUpdate
+from app.services import idempotency_service, risk_service
 from app.services.export_service import export_json_bytes
+from app.services.ingest_pipeline import (
+    AtlasNameIndex,
+    CsvIngestor,
+    IngestCheckpoint,
+    default_checkpoint_path,
+    default_lint_cache_path,
+    map_source_reference,
+    normalize_regulation_token,
+)
+from app.services.reference_data import ReferenceRegistry
 
 
 INVALID_CARD = {
@@ -98,6 +123,72 @@ def test_import_idempotency(tmp_path, ingest_runs):
     assert count == 1
 
 
+def test_upsert_merges_by_hash_with_constant_lookups(tmp_path):
+    header = "risk_id,risk_name,description,ai_model_type,probability_level,impact_level,impact_dimensions,trigger_conditions,technological_dependencies,known_mitigations,regulatory_requirements,operational_priority,source_reference,provenance,related_risks,categories,energy_context,version\n"
+
+    def row(risk_id, name, impact=4):
+        return f"{risk_id},{name},{name} description,forecasting,3,{impact},reliability,Trigger,Dependency,Mitigation,NERC CIP-013,3,MITRE_ATLAS:AML.T0020,,,governance.oversight,control_rooms,1.0\n"
+
+    ingestor = CsvIngestor(editor="test")
+
+    def load(name, *rows):
+        seed_file = tmp_path / name
+        seed_file.write_text(header + "".join(rows))
+        entries, issues = ingestor.load(seed_file)
+        assert not issues
+        return entries
+
+    with get_session() as session:
+        ingestor.upsert(session, load("existing.csv", row("EG-R-9201", "Grid Forecast Drift")))
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        if re.match(r"\s*SELECT\b.*\bFROM risk(_provenance)?\b(?!_)|\s*INSERT INTO risk_provenance\b", statement, re.S):
+            statements.append(statement)
+
+    def lookups(entries):
+        statements.clear()
+        with get_session() as session:
+            engine = session.get_bind()
+            event.listen(engine, "before_cursor_execute", record)
+            try:
+                counts = ingestor.upsert(session, entries)
+            finally:
+                event.remove(engine, "before_cursor_execute", record)
+        return counts, len(statements)
+
+    # Same title and description under a new id: merged into EG-R-9201 via merge_hash.
+    small = load("small.csv", row("EG-R-9299", "Grid Forecast Drift", impact=5), row("EG-R-9202", "Relay Misfire"))
+    counts, small_lookups = lookups(small)
+    assert (counts.inserted, counts.updated) == (1, 1)
+    large = load(
+        "large.csv",
+        row("EG-R-9202", "Relay Misfire", impact=5),
+        *(row(f"EG-R-92{index}", f"Distinct Risk {index}") for index in range(10, 18)),
+    )
+    counts, large_lookups = lookups(large)
+    assert (counts.inserted, counts.updated) == (8, 1)
+    # Fingerprints, targets by id, targets by merge_hash, stored provenance and the provenance
+    # insert: one statement each, whatever the batch size.
+    assert small_lookups == large_lookups == 5
+
+    # A later row merging into a risk created earlier in the same batch.
+    with get_session() as session:
+        dupes = load("dupes.csv", row("EG-R-9230", "Breaker Fatigue"), row("EG-R-9231", "Breaker Fatigue", impact=2))
+        counts = ingestor.upsert(session, dupes)
+    assert (counts.inserted, counts.updated) == (1, 1)
+
+    with get_session() as session:
+        assert session.get(Risk, "EG-R-9299") is None and session.get(Risk, "EG-R-9231") is None
+        assert session.get(Risk, "EG-R-9201").card["impact_level"] == 5
+        assert session.get(Risk, "EG-R-9230").card["impact_level"] == 2
+        assert session.query(Risk).count() == 11
+        for risk_id in ("EG-R-9201", "EG-R-9230"):
+            stored = session.query(RiskProvenance).filter_by(risk_id=risk_id).count()
+            assert stored == 2 == session.get(Risk, risk_id).card["provenance_summary"]["count"]
+
+
 def test_export_parity(tmp_path):
     runner = CliRunner()
     runner.invoke(cli_app, ["ingest", "canonical-seed", "--file", str(Path("seed_canonical_risks.csv"))])
@@ -124,3 +215,722 @@ def test_post_new_risk_json(client):
     assert response.status_code == 201
     data = response.json()
     assert data["risk_id"] == payload["risk_id"]
+
+
+def test_card_filters_applied_in_query(client):
+    payload = json.loads(json.dumps(VALID_CARD))
+    payload["card"]["lifecycle_stage"] = "monitoring"
+    payload["card"]["altai_requirements"] = ["Robustness"]
+    created = client.post("/risks", json=payload)
+    assert created.status_code == 201
+    # Stored lowercase so Postgres containment matches as case-insensitively as SQLite.
+    assert created.json()["card"]["altai_requirements"] == ["robustness"]
+    other = json.loads(json.dumps(VALID_CARD))
+    other["risk_id"] = "EG-R-9002"
+    other["card"]["categories"] = ["technical.attack"]
+    assert client.post("/risks", json=other).status_code == 201
+
+    by_category = client.get("/risks", params={"category": "governance.monitoring"}).json()
+    assert [item["risk_id"] for item in by_category] == [VALID_CARD["risk_id"]]
+    by_stage = client.get("/risks", params={"lifecycle_stage": "monitoring"}).json()
+    assert [item["risk_id"] for item in by_stage] == [VALID_CARD["risk_id"]]
+    by_altai = client.get("/risks", params={"altai": "Robustness"}).json()
+    assert [item["risk_id"] for item in by_altai] == [VALID_CARD["risk_id"]]
+    limited = client.get("/risks", params={"limit": 1}).json()
+    assert [item["risk_id"] for item in limited] == [VALID_CARD["risk_id"]]
+    patched = client.patch("/risks/EG-R-9002", json={"card_updates": {"categories": ["Technical.Attack"]}})
+    assert patched.json()["card"]["categories"] == ["technical.attack"]
+    with get_session() as session:
+        assert session.get(Risk, "EG-R-9002").card["categories"] == ["technical.attack"]
+
+    # A card stored before lists were lowercased reads the same from every endpoint.
+    with get_session() as session:
+        session.execute(
+            text(
+                "UPDATE risk SET card = json_set(card, '$.categories', json('[\"Technical.Attack\"]')), "
+                "revision = revision + 1 WHERE risk_id = 'EG-R-9002'"
+            )
+        )
+    legacy = client.get("/risks/EG-R-9002").json()["card"]["categories"]
+    listed = [item["card"]["categories"] for item in client.get("/risks").json() if item["risk_id"] == "EG-R-9002"]
+    projected = client.get("/risks", params={"fields": "categories"}).json()[1]["card"]["categories"]
+    assert legacy == listed[0] == projected == ["technical.attack"]
+
+
+def test_cursor_pagination(client):
+    risk_ids = ["EG-R-9011", "EG-R-9012", "EG-R-9013"]
+    for risk_id in risk_ids:
+        payload = json.loads(json.dumps(VALID_CARD))
+        payload["risk_id"] = risk_id
+        assert client.post("/risks", json=payload).status_code == 201
+    seen = []
+    params = {"limit": 2}
+    while True:
+        response = client.get("/risks", params=params)
+        assert response.status_code == 200
+        seen.extend(item["risk_id"] for item in response.json())
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if not next_cursor:
+            break
+        params["cursor"] = next_cursor
+    assert seen == risk_ids
+    assert client.get("/risks", params={"cursor": "%%%"}).status_code == 400
+    assert client.get("/risks", params={"cursor": risk_service.encode_cursor([123])}).status_code == 400
+    assert client.get("/risks", params={"q": "forecast", "cursor": risk_service.encode_cursor(["a", "b"])}).status_code == 400
+    cors = client.get("/risks", params={"limit": 1}, headers={"Origin": "https://dashboard.example"})
+    assert "X-Next-Cursor" in cors.headers["Access-Control-Expose-Headers"]
+
+
+def test_full_text_search_ranks_and_prefix_matches(client):
+    strong = json.loads(json.dumps(VALID_CARD))
+    strong["risk_id"] = "EG-R-9021"
+    strong["card"]["risk_name"] = "Forecast drift in forecasting pipelines"
+    weak = json.loads(json.dumps(VALID_CARD))
+    weak["risk_id"] = "EG-R-9022"
+    weak["card"]["risk_name"] = "Telemetry gap"
+    weak["card"]["description"] = "Missing telemetry degrades state estimation forecasts."
+    unrelated = json.loads(json.dumps(VALID_CARD))
+    unrelated["risk_id"] = "EG-R-9023"
+    unrelated["card"].update(risk_name="Vendor lock-in", description="Single supplier dependency.", trigger_conditions="Contract renewal")
+    for payload in (weak, strong, unrelated):
+        assert client.post("/risks", json=payload).status_code == 201
+
+    ranked = [item["risk_id"] for item in client.get("/risks", params={"q": "forecas"}).json()]
+    assert ranked == ["EG-R-9021", "EG-R-9022"]
+    first = client.get("/risks", params={"q": "forecas", "limit": 1})
+    second = client.get("/risks", params={"q": "forecas", "limit": 1, "cursor": first.headers["X-Next-Cursor"]})
+    assert [item["risk_id"] for item in second.json()] == ["EG-R-9022"]
+    # Provenance and JSON keys are not part of the search document.
+    assert client.get("/risks", params={"q": "unit-test"}).json() == []
+
+
+def test_init_db_backfills_search_on_existing_database(client):
+    assert client.post("/risks", json=VALID_CARD).status_code == 201
+    with get_session() as session:
+        engine = session.get_bind()
+    # A database created before search existed: the risk table is there, risk_search is not.
+    with engine.begin() as connection:
+        connection.exec_driver_sql("DROP TABLE risk_search")
+        for trigger in ("risk_search_ai", "risk_search_au", "risk_search_ad"):
+            connection.exec_driver_sql(f"DROP TRIGGER {trigger}")
+    init_db.init_db()
+    init_db.init_db()
+    assert [item["risk_id"] for item in client.get("/risks", params={"q": "forecast"}).json()] == [VALID_CARD["risk_id"]]
+    assert client.patch(f"/risks/{VALID_CARD['risk_id']}", json={"card_updates": {"risk_name": "Telemetry gap"}}).status_code == 200
+    assert client.get("/risks", params={"q": "telemetry"}).json()[0]["risk_id"] == VALID_CARD["risk_id"]
+
+
+def test_context_filters_use_link_tables(client, tmp_path):
+    seed_file = tmp_path / "seed.csv"
+    seed_file.write_text(
+        "risk_id,risk_name,description,ai_model_type,probability_level,impact_level,impact_dimensions,trigger_conditions,technological_dependencies,known_mitigations,regulatory_requirements,operational_priority,source_reference,provenance,related_risks,categories,energy_context,version\n"
+        "EG-R-9101,Control Room Risk,Operator overload,forecasting,3,4,reliability,Trigger,Dependency,Mitigation,NERC CIP-013,3,MITRE_ATLAS:AML.T0020,,,governance.oversight,control_rooms,1.0\n"
+        "EG-R-9102,Retail Risk,Billing errors,forecasting,3,4,reliability,Trigger,Dependency,Mitigation,NERC CIP-013,3,MITRE_ATLAS:AML.T0020,,,governance.oversight,retail_energy,1.0\n"
+    )
+    result = CliRunner().invoke(cli_app, ["ingest", "canonical-seed", "--file", str(seed_file)])
+    assert result.exit_code == 0
+
+    by_context = client.get("/risks", params={"context": "retail_energy"}).json()
+    assert [item["risk_id"] for item in by_context] == ["EG-R-9102"]
+    critical = client.get("/risks", params={"min_criticality": 4}).json()
+    assert [item["risk_id"] for item in critical] == ["EG-R-9101"]
+    assert len(client.get("/risks", params={"min_exposure": 3}).json()) == 2
+    assert client.get("/risks", params={"min_exposure": 4}).json() == []
+
+
+def test_api_writes_keep_context_links_in_sync(client):
+    def risk_ids(**params):
+        return [item["risk_id"] for item in client.get("/risks", params=params).json()]
+
+    created = json.loads(json.dumps(VALID_CARD))
+    created["card"]["energy_context"] = ["generation_renewables"]
+    assert client.post("/risks", json=created).status_code == 201
+    assert risk_ids(context="generation_renewables") == [VALID_CARD["risk_id"]]
+    assert risk_ids(category="governance.monitoring", min_exposure=3) == [VALID_CARD["risk_id"]]
+
+    url = f"/risks/{VALID_CARD['risk_id']}"
+    patched = client.patch(url, json={"card_updates": {"energy_context": ["control_rooms"]}})
+    assert patched.status_code == 200
+    assert risk_ids(context="generation_renewables") == []
+    assert risk_ids(context="control_rooms") == [VALID_CARD["risk_id"]]
+
+    replaced = dict(created["card"], energy_context=["retail_energy"], categories=["technical.attack"])
+    assert client.put(url, json={"card": replaced}).status_code == 200
+    assert risk_ids(context="control_rooms") == []
+    assert risk_ids(context="retail_energy") == [VALID_CARD["risk_id"]]
+    with get_session() as session:
+        assert [link.category_id for link in session.query(RiskCategory).filter_by(risk_id=VALID_CARD["risk_id"])] == [
+            "technical.attack"
+        ]
+
+    bulk = json.loads(json.dumps(VALID_CARD))
+    bulk["risk_id"] = "EG-R-9043"
+    bulk["card"]["energy_context"] = ["control_rooms", "unknown_context"]
+    moved = dict(created, card=dict(created["card"], energy_context=["generation_renewables"]))
+    assert client.post("/risks/bulk", json=[moved, bulk]).status_code == 200
+    assert risk_ids(context="control_rooms") == ["EG-R-9043"]
+    assert risk_ids(context="generation_renewables") == [VALID_CARD["risk_id"]]
+    assert risk_ids(context="retail_energy") == []
+
+
+def test_sparse_fieldsets(client):
+    assert client.post("/risks", json=VALID_CARD).status_code == 201
+    response = client.get("/risks", params={"fields": "risk_name,impact_level,categories"})
+    assert response.status_code == 200
+    item = response.json()[0]
+    assert item["risk_id"] == VALID_CARD["risk_id"]
+    assert item["card"] == {
+        "risk_name": VALID_CARD["card"]["risk_name"],
+        "impact_level": VALID_CARD["card"]["impact_level"],
+        "categories": VALID_CARD["card"]["categories"],
+    }
+    assert client.get("/risks", params={"fields": "risk_name,secret"}).status_code == 400
+    schema = client.get("/openapi.json").json()["paths"]["/risks"]["get"]["responses"]["200"]
+    published = json.dumps(schema["content"]["application/json"]["schema"])
+    assert "#/components/schemas/RiskProjection" in published and "#/components/schemas/RiskResponse" in published
+
+
+def test_list_fast_path_matches_validated_response(client):
+    payload = json.loads(Path("new_risk.json").read_text(encoding="utf-8"))
+    assert client.post("/risks", json=payload).status_code == 201
+    listed = client.get("/risks", params={"ids": payload["risk_id"]}).json()
+    single = client.get(f"/risks/{payload['risk_id']}").json()
+    assert listed == [single]
+
+
+def test_conditional_get_with_etags(client):
+    assert client.post("/risks", json=VALID_CARD).status_code == 201
+    single = client.get(f"/risks/{VALID_CARD['risk_id']}")
+    etag = single.headers["ETag"]
+    cached = client.get(f"/risks/{VALID_CARD['risk_id']}", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+
+    listing = client.get("/risks", params={"category": "governance.monitoring"})
+    list_etag = listing.headers["ETag"]
+    assert client.get("/risks", params={"category": "governance.monitoring"}, headers={"If-None-Match": list_etag}).status_code == 304
+    assert client.get("/risks", params={"category": "technical.attack"}, headers={"If-None-Match": list_etag}).status_code == 200
+
+    other = json.loads(json.dumps(VALID_CARD))
+    other["risk_id"] = "EG-R-9002"
+    assert client.post("/risks", json=other).status_code == 201
+    refreshed = client.get("/risks", params={"category": "governance.monitoring"}, headers={"If-None-Match": list_etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["ETag"] != list_etag
+
+    # A write within the same second leaves max(updated_at) unchanged; the revision total still moves.
+    patched_etag = refreshed.headers["ETag"]
+    assert client.patch("/risks/EG-R-9002", json={"card_updates": {"impact_level": 5}}).status_code == 200
+    after_patch = client.get("/risks", params={"category": "governance.monitoring"}, headers={"If-None-Match": patched_etag})
+    assert after_patch.status_code == 200
+
+
+def test_read_cache_hits_and_invalidation(client):
+    assert client.post("/risks", json=VALID_CARD).status_code == 201
+    before = client.get("/cache/stats").json()["risks"]
+    client.get(f"/risks/{VALID_CARD['risk_id']}")
+    client.get(f"/risks/{VALID_CARD['risk_id']}")
+    after = client.get("/cache/stats").json()["risks"]
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
+    client.get("/risks", params={"ids": VALID_CARD["risk_id"]})
+
+    patch = {"status": "retired", "version": None, "card_updates": {"risk_name": "Renamed"}}
+    assert client.patch(f"/risks/{VALID_CARD['risk_id']}", json=patch).status_code == 200
+    refreshed = client.get(f"/risks/{VALID_CARD['risk_id']}").json()
+    assert refreshed["status"] == "retired"
+    assert refreshed["card"]["risk_name"] == "Renamed"
+    listed = client.get("/risks", params={"ids": VALID_CARD["risk_id"]}).json()
+    assert listed[0]["card"]["risk_name"] == "Renamed"
+
+    # A write from another process (ingest CLI, another worker) bypasses this process's eviction.
+    stale_etag = client.get(f"/risks/{VALID_CARD['risk_id']}").headers["ETag"]
+    with get_session() as session:
+        session.execute(
+            text("UPDATE risk SET status = 'draft', revision = revision + 1 WHERE risk_id = :risk_id"),
+            {"risk_id": VALID_CARD["risk_id"]},
+        )
+    fresh = client.get(f"/risks/{VALID_CARD['risk_id']}", headers={"If-None-Match": stale_etag})
+    assert fresh.status_code == 200
+    assert fresh.json()["status"] == "draft" and fresh.json()["revision"] == refreshed["revision"] + 1
+    assert fresh.headers["ETag"] == risk_service.risk_etag(RiskResponse(**fresh.json()))
+    assert client.get("/risks", params={"ids": VALID_CARD["risk_id"]}).json()[0]["status"] == "draft"
+
+
+def test_batch_get_preserves_order_and_reports_missing(client):
+    for risk_id in ("EG-R-9031", "EG-R-9032"):
+        payload = json.loads(json.dumps(VALID_CARD))
+        payload["risk_id"] = risk_id
+        assert client.post("/risks", json=payload).status_code == 201
+    response = client.post("/risks/batch-get", json={"ids": ["EG-R-9032", "EG-R-0000", "EG-R-9031", "EG-R-9032"]})
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["risk_id"] for item in body["items"]] == ["EG-R-9032", "EG-R-9031"]
+    assert body["missing"] == ["EG-R-0000"]
+
+
+def test_async_read_routes():
+    with TestClient(create_app(async_db=True)) as async_client:
+        assert async_client.post("/risks", json=VALID_CARD).status_code == 201
+        single = async_client.get(f"/risks/{VALID_CARD['risk_id']}")
+        assert single.status_code == 200
+        assert async_client.get(f"/risks/{VALID_CARD['risk_id']}", headers={"If-None-Match": single.headers["ETag"]}).status_code == 304
+        listed = async_client.get("/risks", params={"q": "forecast"}).json()
+        assert [item["risk_id"] for item in listed] == [VALID_CARD["risk_id"]]
+        assert async_client.get("/risks/brief").json()[0]["risk_id"] == VALID_CARD["risk_id"]
+        assert async_client.get("/risks/EG-R-0000").status_code == 404
+
+
+def test_bulk_upsert_reports_per_item_results(client):
+    existing = json.loads(json.dumps(VALID_CARD))
+    assert client.post("/risks", json=existing).status_code == 201
+    updated = json.loads(json.dumps(VALID_CARD))
+    updated["card"]["risk_name"] = "Forecast Bias (revised)"
+    created = json.loads(json.dumps(VALID_CARD))
+    created["risk_id"] = "EG-R-9041"
+    response = client.post("/risks/bulk", json=[updated, created, INVALID_CARD, created])
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["updated"], body["invalid"]) == (1, 1, 2)
+    assert [item["status"] for item in body["results"]] == ["updated", "created", "invalid", "invalid"]
+    assert client.get(f"/risks/{VALID_CARD['risk_id']}").json()["card"]["risk_name"] == "Forecast Bias (revised)"
+
+    ndjson = "\n".join(json.dumps(item) for item in (created,)) + "\n"
+    response = client.post("/risks/bulk", content=ndjson, headers={"Content-Type": "application/x-ndjson"})
+    assert response.json()["updated"] == 1
+
+    response = client.post("/risks/bulk", json=[{"risk_id": 123, "card": {}}])
+    assert response.status_code == 200
+    result = response.json()["results"][0]
+    assert (result["risk_id"], result["status"]) == (None, "invalid")
+
+
+def test_link_sync_only_writes_differences(client):
+    assert client.post("/risks", json=VALID_CARD).status_code == 201
+    risk_id = VALID_CARD["risk_id"]
+    with get_session() as session:
+        risk_service.sync_categories(session, {risk_id: ["governance.monitoring", "governance.oversight"]})
+        risk_service.sync_contexts(session, {risk_id: [{"context_id": "transmission_planning", "exposure_level": 2}]})
+
+    writes = []
+
+    def record(conn, cursor, statement, *args):
+        writes.append(statement)
+
+    with get_session() as session:
+        engine = session.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            risk_service.sync_categories(session, {risk_id: ["governance.oversight", "governance.monitoring"]})
+            risk_service.sync_contexts(
+                session, {risk_id: [{"context_id": "transmission_planning", "exposure_level": 2}]}
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+    assert not [stmt for stmt in writes if not stmt.lstrip().upper().startswith("SELECT")]
+
+    with get_session() as session:
+        risk_service.sync_categories(session, {risk_id: ["governance.oversight"]})
+        risk_service.sync_contexts(session, {risk_id: [{"context_id": "transmission_planning", "exposure_level": 4}]})
+    with get_session() as session:
+        categories = session.query(RiskCategory.category_id).filter_by(risk_id=risk_id).all()
+        exposure = session.query(RiskContext.exposure_level).filter_by(risk_id=risk_id).scalar()
+    assert [row.category_id for row in categories] == ["governance.oversight"]
+    assert exposure == 4
+
+
+def test_streaming_ingest_resumes_from_checkpoint(tmp_path, monkeypatch):
+    seed_file = tmp_path / "seed.csv"
+    seed_file.write_bytes(Path("seed_canonical_risks.csv").read_bytes())
+    expected, issues = CsvIngestor(editor="test").load(seed_file)
+    assert not issues
+    checkpoint = default_checkpoint_path(seed_file)
+
+    calls = []
+    original_upsert = CsvIngestor.upsert
+
+    def failing_upsert(self, session, entries):
+        calls.append(len(entries))
+        if len(calls) == 3:
+            raise RuntimeError("database went away")
+        return original_upsert(self, session, entries)
+
+    monkeypatch.setattr(CsvIngestor, "upsert", failing_upsert)
+    runner = CliRunner()
+    args = ["ingest", "canonical-seed", "--file", str(seed_file), "--chunk-size", "5"]
+    result = runner.invoke(cli_app, args)
+    assert result.exit_code != 0
+    assert json.loads(checkpoint.read_text())["last_row"] == expected[9].row
+    with get_session() as session:
+        assert session.query(Risk).count() == 10
+
+    result = runner.invoke(cli_app, [*args, "--resume"])
+    assert result.exit_code == 0, result.output
+    assert f"({len(expected) - 10} rows streamed)" in result.output
+    assert not checkpoint.exists()
+    with get_session() as session:
+        stored = {risk.risk_id: risk.card["related_risks"] for risk in session.query(Risk)}
+    assert stored == {entry.risk_id: entry.card["related_risks"] for entry in expected}
+
+    seed_file.write_text(seed_file.read_text() + "\n")
+    IngestCheckpoint(file_hash="stale", last_row=2).write(checkpoint)
+    result = runner.invoke(cli_app, [*args, "--resume"])
+    assert result.exit_code == 1
+    assert "different version" in result.output
+
+
+def test_parallel_normalization_matches_serial(tmp_path):
+    seed_file = tmp_path / "seed.csv"
+    with Path("seed_canonical_risks.csv").open(encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+    # Invalid levels in rows far apart so lint issues from several chunks have to be merged in order.
+    for index in (3, 11, 19):
+        rows[index]["impact_level"] = "9"
+    with seed_file.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    serial = CsvIngestor(editor="test").load(seed_file)
+    parallel = CsvIngestor(editor="test", workers=3).load(seed_file)
+    assert len(serial[1]) == 3
+    assert parallel == serial
+
+    runner = CliRunner()
+    serial_lint = runner.invoke(cli_app, ["lint", "--file", str(seed_file)])
+    parallel_lint = runner.invoke(cli_app, ["lint", "--file", str(seed_file), "--workers", "2"])
+    assert parallel_lint.exit_code == serial_lint.exit_code
+    assert parallel_lint.output == serial_lint.output
+
+
+def test_if_match_rejects_stale_writes(client):
+    assert client.post("/risks", json=VALID_CARD).status_code == 201
+    url = f"/risks/{VALID_CARD['risk_id']}"
+    first = client.get(url)
+    etag = first.headers["ETag"]
+    assert first.json()["revision"] == 1
+
+    patched = client.patch(
+        url,
+        json={"status": None, "version": None, "card_updates": {"risk_name": "Renamed"}},
+        headers={"If-Match": etag},
+    )
+    assert patched.status_code == 200
+    assert patched.json()["revision"] == 2
+    assert patched.headers["ETag"] == client.get(url).headers["ETag"] != etag
+
+    stale = client.put(url, json={"status": "retired"}, headers={"If-Match": etag})
+    assert stale.status_code == 412
+    assert client.put(url, json={"status": "x"}, headers={"If-Match": f"W/{patched.headers['ETag']}"}).status_code == 412
+    assert client.put(url, json={"status": "retired"}, headers={"If-Match": "*"}).json()["revision"] == 3
+
+    # Two writers read the same revision; the second UPDATE matches no row and is rejected.
+    with get_session() as first_writer, get_session() as second_writer:
+        risk_service.update_risk(first_writer, VALID_CARD["risk_id"], RiskUpdate(status="first"))
+        read_by_second = second_writer.get(Risk, VALID_CARD["risk_id"])
+        first_writer.commit()
+        with pytest.raises(StaleDataError):
+            risk_service.update_risk(second_writer, read_by_second.risk_id, RiskUpdate(status="second"))
+        second_writer.rollback()
+    assert client.get(url).json()["status"] == "first"
+
+
+def test_delete_rejects_concurrent_write(client, monkeypatch):
+    assert client.post("/risks", json=VALID_CARD).status_code == 201
+    original_delete = risk_service.delete_risk
+
+    def racing_delete(session, risk_id):
+        # Another writer commits between this request's read and its DELETE.
+        loaded = session.get(Risk, risk_id)
+        with get_session() as other:
+            risk_service.update_risk(other, risk_id, RiskUpdate(status="retired"))
+        return original_delete(session, loaded.risk_id)
+
+    monkeypatch.setattr(risk_service, "delete_risk", racing_delete)
+    assert client.delete(f"/risks/{VALID_CARD['risk_id']}").status_code == 412
+    monkeypatch.undo()
+    assert client.get(f"/risks/{VALID_CARD['risk_id']}").json()["status"] == "retired"
+    assert client.delete(f"/risks/{VALID_CARD['risk_id']}").status_code == 204
+
+
+def test_patch_merges_card_in_a_single_update(client):
+    assert client.post("/risks", json=VALID_CARD).status_code == 201
+    url = f"/risks/{VALID_CARD['risk_id']}"
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with get_session() as session:
+        engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.patch(
+            url, json={"card_updates": {"risk_summary": None, "impact_level": 5, "known_mitigations": ["Retrain"]}}
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+    # The card is patched by one UPDATE; the only other statement appends the provenance row.
+    assert [statement.split()[0] for statement in statements] == ["UPDATE", "INSERT"]
+
+    card = client.get(url).json()["card"]
+    assert card["impact_level"] == 5
+    assert card["known_mitigations"] == ["Retrain"]
+    assert card["risk_summary"] is None
+    assert card["risk_name"] == VALID_CARD["card"]["risk_name"]
+    assert card["provenance_summary"]["last_action"] == "patch"
+
+    invalid = client.patch(url, json={"card_updates": {"impact_level": 9, "risk_name": None}})
+    assert invalid.status_code == 422
+    assert client.get(url).json()["card"]["impact_level"] == 5
+
+    # Provenance entries already stored (from the create, or an earlier patch) are not recorded twice.
+    count = card["provenance_summary"]["count"]
+    for note, added in (("unit-test", 1), ("x", 2), ("x", 1)):
+        response = client.patch(url, json={"card_updates": {"provenance": [{"note": note}]}})
+        assert response.status_code == 200
+        count += added
+        assert response.json()["card"]["provenance_summary"]["count"] == count
+    assert len(client.get(f"{url}/provenance", params={"limit": 100}).json()) == count
+
+
+def test_provenance_history_is_paged_from_its_own_table(client):
+    assert client.post("/risks", json=VALID_CARD).status_code == 201
+    url = f"/risks/{VALID_CARD['risk_id']}"
+    assert client.put(url, json={"card": VALID_CARD["card"]}).status_code == 200
+    card = client.get(url).json()["card"]
+    assert card["provenance"] == []
+    # The unit-test note is stored once even though both writes carried it.
+    assert card["provenance_summary"]["count"] == 3
+    assert card["provenance_summary"]["last_action"] == "replace"
+
+    first = client.get(f"{url}/provenance", params={"limit": 2})
+    assert [item["entry"].get("action") for item in first.json()] == [None, "create"]
+    second = client.get(f"{url}/provenance", params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]})
+    assert [item["action"] for item in second.json()] == ["replace"]
+    assert "X-Next-Cursor" not in second.headers
+    assert client.get("/risks/EG-R-0000/provenance").status_code == 404
+
+    legacy = dict(VALID_CARD["card"], stable_id="EG-R-9050", provenance=[{"note": "legacy"}])
+    with get_session() as session:
+        session.add(Risk(risk_id="EG-R-9050", status="draft", version="1.0", card=legacy))
+    result = CliRunner().invoke(cli_app, ["ingest", "migrate-provenance"])
+    assert result.exit_code == 0
+    migrated = client.get("/risks/EG-R-9050").json()["card"]
+    assert migrated["provenance"] == [] and migrated["provenance_summary"]["count"] == 1
+    assert client.get("/risks/EG-R-9050/provenance").json()[0]["entry"] == {"note": "legacy"}
+
+
+def test_idempotency_key_replays_stored_write(client):
+    headers = {"Idempotency-Key": "create-9040"}
+    created = client.post("/risks", json=VALID_CARD, headers=headers)
+    assert created.status_code == 201
+    retried = client.post("/risks", json=VALID_CARD, headers={**headers, "Origin": "https://dashboard.example"})
+    assert retried.status_code == 201
+    assert retried.headers["Idempotent-Replayed"] == "true"
+    assert retried.headers["Access-Control-Allow-Origin"] == "*"
+    assert retried.json() == created.json()
+    assert client.get(f"/risks/{VALID_CARD['risk_id']}").json()["card"]["provenance_summary"]["count"] == 2
+
+    changed = dict(VALID_CARD, status="retired")
+    assert client.post("/risks", json=changed, headers=headers).status_code == 422
+
+    missing = client.put("/risks/EG-R-0000", json={"status": "x"}, headers={"Idempotency-Key": "put-missing"})
+    assert missing.status_code == 404
+    # Failed writes are not stored, so the key can be retried.
+    assert client.put("/risks/EG-R-0000", json={"status": "x"}, headers={"Idempotency-Key": "put-missing"}).status_code == 404
+
+    with get_session() as session:
+        assert idempotency_service.purge_expired(session, ttl_seconds=60) == 0
+        assert idempotency_service.purge_expired(session, 60, now=datetime.utcnow() + timedelta(minutes=2)) == 1
+    # Once purged the key is free again, even for a different request.
+    reused = client.post("/risks", json=dict(VALID_CARD, risk_id="EG-R-9042"), headers=headers)
+    assert reused.status_code == 201 and "Idempotent-Replayed" not in reused.headers
+
+
+def test_idempotency_lease_and_write_routes_only(client):
+    assert client.post("/risks", json=VALID_CARD).status_code == 201
+    batch = client.post("/risks/batch-get", json={"ids": [VALID_CARD["risk_id"]]}, headers={"Idempotency-Key": "read"})
+    assert batch.status_code == 200 and "Idempotent-Replayed" not in batch.headers
+    with get_session() as session:
+        assert session.get(IdempotencyRecord, "read") is None
+
+    # A claim left behind by a crashed request blocks retries only until its lease runs out.
+    url = f"/risks/{VALID_CARD['risk_id']}"
+    body = {"status": "retired"}
+    fingerprint = idempotency_service.request_fingerprint("PUT", url, json.dumps(body).encode(), None)
+    with get_session() as session:
+        session.add(IdempotencyRecord(key="crashed", request_hash=fingerprint, created_at=datetime.utcnow()))
+    retry = client.put(url, content=json.dumps(body), headers={"Idempotency-Key": "crashed", "Content-Type": "application/json"})
+    assert retry.status_code == 409
+    with get_session() as session:
+        session.get(IdempotencyRecord, "crashed").created_at = datetime.utcnow() - timedelta(minutes=5)
+    retry = client.put(url, content=json.dumps(body), headers={"Idempotency-Key": "crashed", "Content-Type": "application/json"})
+    assert retry.status_code == 200 and retry.json()["status"] == "retired"
+    replayed = client.put(url, content=json.dumps(body), headers={"Idempotency-Key": "crashed", "Content-Type": "application/json"})
+    assert replayed.headers["Idempotent-Replayed"] == "true" and replayed.json() == retry.json()
+
+
+def test_atlas_name_index_matches_full_scan():
+    atlas_ids = ["atlas-data-poisoning", "atlas-evasion-attack", "atlas-prompt-injection-attack", "mit-ai-risk-2.2"]
+
+    def full_scan(slug):
+        matches = set()
+        for atlas_id in atlas_ids:
+            atlas_slug = atlas_id.replace("atlas-", "")
+            atlas_tokens, slug_tokens = set(atlas_slug.split("-")), set(slug.split("-"))
+            shared = atlas_tokens & slug_tokens
+            if slug.endswith(atlas_slug) or atlas_slug.endswith(slug) or (
+                shared and len(shared) >= max(1, min(len(atlas_tokens), len(slug_tokens)) - 1)
+            ):
+                matches.add(atlas_id)
+        return sorted(matches)
+
+    index = AtlasNameIndex(atlas_ids)
+    for slug in ["training-data-poisoning", "poisoning", "injection-attack", "attack", "risk", "", "unrelated-name"]:
+        assert index.match(slug) == full_scan(slug), slug
+
+
+def test_regulation_and_source_normalizers_are_memoized():
+    normalize_regulation_token.cache_clear()
+    ingestor = CsvIngestor(editor="test")
+    value = "EU-AI-Act Article 9; NERC CIP-007-6; ISO/IEC 27036; NIST SP 800-53 Rev 5; Custom rule"
+    expected = ["CUSTOM-RULE", "EU-AI-Act-Art9", "ISO-27036", "NERC-CIP-007-6", "NIST-SP-800-53-Rev5"]
+    assert ingestor._normalize_regulations(value) == expected
+    assert ingestor._normalize_regulations(value) == expected
+    assert normalize_regulation_token.cache_info().hits == 5
+
+    assert map_source_reference(" nerc : cip-002 ") == "NERC:CIP-002"
+    assert map_source_reference("unknown:thing") is None
+
+
+def test_reference_catalogs_load_lazily_from_snapshots(tmp_path):
+    source = tmp_path / "ids.txt"
+    source.write_text("a\nb\n", encoding="utf-8")
+    loads = []
+
+    def registry():
+        reference = ReferenceRegistry(tmp_path / "snapshots")
+        reference.register("ids", [source], lambda: loads.append(1) or set(source.read_text().split()))
+        return reference
+
+    first = registry()
+    assert first.loaded() == []
+    assert first.get("ids") == {"a", "b"}
+    assert first.stats == {"snapshot": 0, "built": 1}
+
+    # A new process reuses the snapshot, even after a touch that leaves the content unchanged.
+    os.utime(source, ns=(0, 0))
+    second = registry()
+    assert second.get("ids") == {"a", "b"}
+    assert second.stats == {"snapshot": 1, "built": 0}
+
+    source.write_text("a\nc\n", encoding="utf-8")
+    third = registry()
+    assert third.get("ids") == {"a", "c"}
+    assert third.stats == {"snapshot": 0, "built": 1}
+    assert len(loads) == 2
+
+
+def test_vocabulary_reloads_without_restart(tmp_path, monkeypatch):
+    vocabulary_file = tmp_path / "vocabulary.json"
+    registry = VocabularyRegistry(vocabulary_file, check_interval=0)
+    monkeypatch.setattr(vocab, "vocabulary_registry", registry)
+    monkeypatch.setattr(init_db, "vocabulary_registry", registry)
+    versions = []
+    registry.subscribe(lambda vocabulary: versions.append(vocabulary.version))
+    ingestor = CsvIngestor(editor="test")
+
+    original = registry.current()
+    assert original.allowed_categories == frozenset(vocab.CATEGORY_DEFINITIONS)
+    _, issues = ingestor._normalize_categories("grid.cyber", row=2)
+    assert [issue.error for issue in issues] == ["Unknown category 'grid.cyber'"]
+
+    categories = dict(vocab.CATEGORY_DEFINITIONS, **{"grid.cyber": {"name": "Grid Cyber", "description": "OT attacks."}})
+    vocabulary_file.write_text(json.dumps({"categories": categories}), encoding="utf-8")
+    assert ingestor._normalize_categories("grid.cyber", row=2) == (["grid.cyber"], [])
+    assert versions == [registry.version] and registry.version != original.version
+
+    assert init_db.refresh_reference_tables() is True
+    assert init_db.refresh_reference_tables() is False
+    with get_session() as session:
+        assert session.get(Category, "grid.cyber").name == "Grid Cyber"
+
+
+def test_lint_cache_only_renormalizes_changed_rows(tmp_path, monkeypatch):
+    seed_file = tmp_path / "seed.csv"
+    cache_path = default_lint_cache_path(seed_file)
+    with Path("seed_canonical_risks.csv").open(encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+
+    def write_rows():
+        with seed_file.open("w", encoding="utf-8", newline="") as handle:
+            writer = csv.DictWriter(handle, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+    normalized = []
+    original = CsvIngestor._normalize_row
+    monkeypatch.setattr(
+        CsvIngestor, "_normalize_row", lambda self, row_num, row: normalized.append(row_num) or original(self, row_num, row)
+    )
+    ingestor = CsvIngestor(editor="test")
+    write_rows()
+    assert ingestor.load(seed_file, cache_path=cache_path) == ingestor.load(seed_file)
+    normalized.clear()
+    assert ingestor.load(seed_file, cache_path=cache_path) == ingestor.load(seed_file)
+    assert len(normalized) == len(rows)  # only the uncached comparison run
+
+    rows[4]["impact_level"] = "9"
+    rows[7]["related_risks"] = "EG-R-9999"
+    rows.insert(0, rows.pop(10))  # moved rows keep their cached result under the new row number
+    write_rows()
+    normalized.clear()
+    cached_entries, cached_issues = ingestor.load(seed_file, cache_path=cache_path, cards=False)
+    assert sorted(normalized) == [7, 10]
+    assert cached_issues == ingestor.load(seed_file)[1]
+    assert [issue.field for issue in cached_issues] == ["impact_level"]
+    normalized.clear()
+    assert ingestor.load(seed_file, cache_path=cache_path, cards=False)[1] == cached_issues
+    assert normalized == []
+
+    rows[5]["impact_level"] = rows[6]["impact_level"]
+    write_rows()
+    assert ingestor.load(seed_file, cache_path=cache_path) == ingestor.load(seed_file)
+    assert [issue.error for issue in ingestor.load(seed_file, cache_path=cache_path, cards=False)[1]] == [
+        "Unknown related risk 'EG-R-9999'"
+    ]
+
+    # Stored as JSON, never unpickled.
+    with closing(sqlite3.connect(cache_path)) as connection:
+        stored = [json.loads(entry) for (entry,) in connection.execute("SELECT entry FROM row_entry")]
+    assert len(stored) == len(rows) and all(isinstance(entry["card"], dict) for entry in stored)
+
+
+def test_reingest_skips_unchanged_rows(client, tmp_path):
+    seed_file = tmp_path / "seed.csv"
+    seed_file.write_bytes(Path("seed_canonical_risks.csv").read_bytes())
+    expected, issues = CsvIngestor(editor="test").load(seed_file)
+    assert not issues
+    runner = CliRunner()
+    args = ["ingest", "canonical-seed", "--file", str(seed_file)]
+    result = runner.invoke(cli_app, args)
+    assert result.exit_code == 0, result.output
+    assert f"{len(expected)} inserted, 0 updated, 0 unchanged" in result.output
+
+    def snapshot():
+        with get_session() as session:
+            risks = {risk.risk_id: (risk.revision, risk.updated_at) for risk in session.query(Risk)}
+            return risks, session.query(RiskProvenance).count()
+
+    before = snapshot()
+    result = runner.invoke(cli_app, args)
+    assert result.exit_code == 0, result.output
+    assert f"0 inserted, 0 updated, {len(expected)} unchanged" in result.output
+    assert snapshot() == before
+
+    risk_id = expected[0].risk_id
+    assert client.patch(f"/risks/{risk_id}", json={"card_updates": {"impact_level": 1}}).status_code == 200
+    result = runner.invoke(cli_app, [*args, "--stream", "--chunk-size", "5"])
+    assert result.exit_code == 0, result.output
+    assert f"0 inserted, 1 updated, {len(expected) - 1} unchanged" in result.output